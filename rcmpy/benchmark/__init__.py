@@ -0,0 +1,96 @@
+"""
+A module implementing a benchmark suite (commands run against synthetic data
+repositories).
+"""
+
+# built-in
+from pathlib import Path
+import platform
+from statistics import median
+from tempfile import TemporaryDirectory
+from typing import Any, Dict, List, Tuple
+
+# internal
+from rcmpy import VERSION
+from rcmpy.benchmark.generate import RepoSpec, generate, variant_names
+from rcmpy.benchmark.measure import run_step
+from rcmpy.client import NO_SERVER_ENV
+
+__all__ = ["RepoSpec", "generate", "run_suite", "compare"]
+
+
+def steps(repo: Path, spec: RepoSpec) -> List[Tuple[str, List[str]]]:
+    """Get the (named) commands the suite runs, in order."""
+
+    result = [
+        ("use", ["use", str(repo)]),
+        ("apply-cold", ["apply"]),
+        ("apply-warm", ["apply"]),
+        ("apply-force", ["apply", "--force"]),
+        ("dump", ["dump"]),
+    ]
+
+    for variant in variant_names(spec):
+        result.extend(
+            [
+                (f"variant-{variant}", ["variant", variant]),
+                (f"apply-{variant}", ["apply"]),
+            ]
+        )
+
+    return result
+
+
+def run_suite(spec: RepoSpec, repeat: int = 1) -> Dict[str, Any]:
+    """
+    Run the benchmark suite. Each repetition starts with empty state and
+    cache directories.
+    """
+
+    results: Dict[str, List[Dict[str, Any]]] = {}
+
+    with TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        repo = generate(root.joinpath("repo"), spec)
+
+        for idx in range(repeat):
+            env = {NO_SERVER_ENV: "1"}
+            for var in ["XDG_STATE_HOME", "XDG_CACHE_HOME"]:
+                path = root.joinpath(str(idx), var.lower())
+                path.mkdir(parents=True)
+                env[var] = str(path)
+
+            for name, args in steps(repo, spec):
+                result = run_step(args, env)
+                assert result["code"] == 0, (name, result)
+                results.setdefault(name, []).append(result)
+
+    return {
+        "version": VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "spec": dict(zip(RepoSpec._fields, spec)),
+        "summary": {
+            name: {
+                "wall_s": median(x["wall_s"] for x in samples),
+                "process_s": median(x["process_s"] for x in samples),
+            }
+            for name, samples in results.items()
+        },
+        "results": results,
+    }
+
+
+def compare(
+    baseline: Dict[str, Any], current: Dict[str, Any], key: str = "wall_s"
+) -> Dict[str, float]:
+    """
+    Compare the median of a measurement for each step (the current value
+    divided by the baseline value).
+    """
+
+    return {
+        name: value[key] / baseline["summary"][name][key]
+        for name, value in current["summary"].items()
+        if name in baseline["summary"] and baseline["summary"][name][key]
+    }
@@ -0,0 +1,69 @@
+"""
+Run the benchmark suite from the command line.
+"""
+
+# built-in
+from argparse import ArgumentParser
+import json
+from pathlib import Path
+import sys
+from typing import List
+
+# internal
+from rcmpy.benchmark import RepoSpec, compare, run_suite
+
+
+def main(argv: List[str] = None) -> int:
+    """Benchmark entry-point."""
+
+    parser = ArgumentParser(description="benchmark commands")
+
+    defaults = RepoSpec()
+    for field in RepoSpec._fields:
+        parser.add_argument(
+            f"--{field.replace('_', '-')}",
+            type=int,
+            default=getattr(defaults, field),
+            help="(default: %(default)s)",
+        )
+
+    parser.add_argument(
+        "-r",
+        "--repeat",
+        type=int,
+        default=1,
+        help="number of times to run the suite (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-o", "--output", type=Path, help="file to write results to (JSON)"
+    )
+    parser.add_argument(
+        "--compare",
+        type=Path,
+        help="previous results to compare against",
+    )
+
+    args = parser.parse_args(argv)
+
+    result = run_suite(
+        RepoSpec(*(getattr(args, x) for x in RepoSpec._fields)),
+        repeat=args.repeat,
+    )
+
+    if args.output:
+        args.output.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    else:
+        print(json.dumps(result["summary"], indent=2))
+
+    if args.compare:
+        ratios = compare(
+            json.loads(args.compare.read_text(encoding="utf-8")), result
+        )
+        for name, ratio in ratios.items():
+            print(f"{name:24} {ratio:6.2f}x", file=sys.stderr)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
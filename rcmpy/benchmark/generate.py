@@ -0,0 +1,134 @@
+"""
+A module for generating synthetic data repositories.
+"""
+
+# built-in
+import os
+from pathlib import Path
+from time import time_ns
+from typing import Any, Dict, List, NamedTuple
+
+# third-party
+from vcorelib.io import ARBITER
+
+# internal
+from rcmpy import PKG_NAME
+
+
+class RepoSpec(NamedTuple):
+    """Parameters for a synthetic data repository."""
+
+    # Number of template files.
+    templates: int = 10
+
+    # Number of managed files (outputs cycle through templates).
+    files: int = 20
+
+    # Number of config files (and keys in each).
+    configs: int = 10
+    config_size: int = 10
+
+    # Number of variant layers (in addition to 'common').
+    variants: int = 2
+
+    # Depth of the chain of files that variables include.
+    include_depth: int = 2
+
+
+def variant_names(spec: RepoSpec) -> List[str]:
+    """Get the names of a repository's variants."""
+    return [f"variant_{idx}" for idx in range(spec.variants)]
+
+
+def write(path: Path, data: Any) -> None:
+    """Write a data file (and create its parent directory)."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    assert ARBITER.encode(path, data)[0], path
+
+
+def generate(root: Path, spec: RepoSpec) -> Path:
+    """Generate a synthetic data repository."""
+
+    # Manifest.
+    write(
+        root.joinpath(f"{PKG_NAME}.yaml"),
+        {
+            "files": [
+                {
+                    "template": f"template_{idx % spec.templates}.txt",
+                    "name": f"file_{idx}.txt",
+                    "link": bool(idx % 2),
+                    "condition": "True" if idx % 3 else "'platform' in sys",
+                }
+                for idx in range(spec.files)
+            ]
+        },
+    )
+
+    # A chain of files that variables include.
+    shared = root.joinpath("shared")
+    for depth in range(spec.include_depth):
+        data: Dict[str, Any] = {f"shared_{depth}": depth}
+        if depth + 1 < spec.include_depth:
+            data["includes"] = [f"level_{depth + 1}.yaml"]
+        write(shared.joinpath(f"level_{depth}.yaml"), data)
+
+    # Variables (each variant overrides some of them).
+    variables: Dict[str, Any] = {
+        f"value_{idx}": idx for idx in range(spec.config_size)
+    }
+    if spec.include_depth:
+        variables["includes"] = ["../../shared/level_0.yaml"]
+    write(root.joinpath("variables", "common", "values.yaml"), variables)
+
+    # Configs (rendered with variables).
+    for idx in range(spec.configs):
+        root.joinpath("configs", "common").mkdir(parents=True, exist_ok=True)
+        root.joinpath("configs", "common", f"config_{idx}.yaml").write_text(
+            "\n".join(
+                ["---"]
+                + [
+                    f"key_{key}: {{{{ values.value_{key} }}}}"
+                    for key in range(spec.config_size)
+                ]
+            )
+            + "\n",
+            encoding="utf-8",
+        )
+
+    for idx, variant in enumerate(variant_names(spec)):
+        write(
+            root.joinpath("variables", variant, "values.yaml"),
+            {"value_0": 1000 + idx},
+        )
+        write(
+            root.joinpath("configs", variant, "config_0.yaml"),
+            {"variant": variant},
+        )
+        write(root.joinpath("includes", f"{variant}.yaml"), {})
+
+    # Templates (each reads a few config values).
+    templates = root.joinpath("templates", "common")
+    templates.mkdir(parents=True, exist_ok=True)
+    for idx in range(spec.templates):
+        config = f"config_{idx % max(spec.configs, 1)}"
+        lines = [f"Template {idx}."]
+        if spec.configs:
+            lines.extend(
+                f"{{{{ {config}.key_{key} }}}}"
+                for key in range(min(spec.config_size, 3))
+            )
+        templates.joinpath(f"template_{idx}.txt.j2").write_text(
+            "\n".join(lines) + "\n", encoding="utf-8"
+        )
+
+    # Make files look like they weren't just edited (recently modified files
+    # aren't trusted by change detection).
+    mtime = time_ns() - 24 * 3600 * 10**9
+    for directory, _, names in os.walk(root, topdown=False):
+        for name in names:
+            os.utime(os.path.join(directory, name), ns=(mtime, mtime))
+        os.utime(directory, ns=(mtime, mtime))
+
+    return root
@@ -0,0 +1,127 @@
+"""
+A module for measuring individual command-line invocations.
+"""
+
+# built-in
+from collections import Counter
+import json
+import os
+from pathlib import Path
+import subprocess
+import sys
+from time import perf_counter_ns
+from typing import Any, Dict, List, Optional
+
+# internal
+from rcmpy import PKG_NAME
+
+# Audit events for file-system operations (stat-like calls aren't audited).
+FS_EVENTS = {
+    "open",
+    "os.listdir",
+    "os.scandir",
+    "os.mkdir",
+    "os.rmdir",
+    "os.remove",
+    "os.rename",
+    "os.symlink",
+    "os.link",
+    "os.chmod",
+    "os.utime",
+    "os.truncate",
+    "shutil.copyfile",
+}
+
+
+def io_counters() -> Dict[str, int]:
+    """
+    Get this process' read and write system-call counts (only available on
+    Linux).
+    """
+
+    result: Dict[str, int] = {}
+
+    path = Path("/proc/self/io")
+    if path.is_file():
+        for line in path.read_text(encoding="utf-8").splitlines():
+            key, value = line.split(":", maxsplit=1)
+            if key in {"syscr", "syscw"}:
+                result[key] = int(value)
+
+    return result
+
+
+def peak_rss() -> Optional[int]:
+    """Get this process' peak resident-set size (in bytes)."""
+
+    try:
+        # pylint: disable=import-outside-toplevel
+        import resource
+    except ImportError:
+        return None
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Linux reports kilobytes, macOS reports bytes.
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def measure(args: List[str]) -> Dict[str, Any]:
+    """Run a command (in this process) and measure it."""
+
+    events: Counter[str] = Counter()
+
+    def hook(event: str, _: Any) -> None:
+        """Count file-system events."""
+        if event in FS_EVENTS:
+            events[event] += 1
+
+    # pylint: disable=import-outside-toplevel
+    from rcmpy.entry import main
+
+    sys.addaudithook(hook)
+
+    counters = io_counters()
+    start = perf_counter_ns()
+    code = main([PKG_NAME, *args])
+    elapsed = perf_counter_ns() - start
+
+    syscalls: Dict[str, int] = dict(events)
+    syscalls.update(
+        (key, value - counters[key]) for key, value in io_counters().items()
+    )
+
+    return {
+        "code": code,
+        "wall_s": elapsed / 1e9,
+        "peak_rss": peak_rss(),
+        "syscalls": syscalls,
+    }
+
+
+def run_step(args: List[str], env: Dict[str, str]) -> Dict[str, Any]:
+    """Run and measure a command in a new interpreter."""
+
+    start = perf_counter_ns()
+    result = subprocess.run(
+        [sys.executable, "-m", f"{PKG_NAME}.benchmark.measure", *args],
+        env={**os.environ, **env},
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        check=True,
+    )
+    elapsed = perf_counter_ns() - start
+
+    data = dict(json.loads(result.stdout.splitlines()[-1]))
+
+    # Also include interpreter start-up and import time.
+    data["process_s"] = elapsed / 1e9
+    return data
+
+
+if __name__ == "__main__":
+    # Keep command output separate from the measurement.
+    _STDOUT = sys.stdout
+    sys.stdout = sys.stderr
+    _RESULT = measure(sys.argv[1:])
+    print(json.dumps(_RESULT), file=_STDOUT)
@@ -0,0 +1,123 @@
+"""
+A client for running commands in a (warm) server process. This module only
+uses the standard library, so that commands can check for a server before
+importing any of this package's (heavier) dependencies.
+"""
+
+# built-in
+from argparse import Namespace
+import json
+import os
+from pathlib import Path
+import socket
+import sys
+from typing import Any, Dict, Optional
+
+# internal
+from rcmpy import PKG_NAME, VERSION
+
+# Set this environment variable (to anything) to never forward commands.
+NO_SERVER_ENV = "RCMPY_NO_SERVER"
+
+
+def socket_path() -> Path:
+    """
+    Get the path to the server's socket (in the user's runtime directory, or
+    state directory if there isn't one).
+    """
+
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return Path(runtime, PKG_NAME, "server.sock")
+
+    return Path(
+        os.environ.get(
+            "XDG_STATE_HOME", str(Path.home().joinpath(".local", "state"))
+        ),
+        PKG_NAME,
+        "server.sock",
+    )
+
+
+def encode_args(args: Namespace) -> Dict[str, Any]:
+    """Encode parsed command-line arguments (so they can be sent as JSON)."""
+
+    return {
+        key: {"path": str(value)} if isinstance(value, Path) else value
+        for key, value in vars(args).items()
+    }
+
+
+def decode_args(data: Dict[str, Any]) -> Namespace:
+    """Decode command-line arguments encoded by 'encode_args'."""
+
+    return Namespace(
+        **{
+            key: Path(value["path"]) if isinstance(value, dict) else value
+            for key, value in data.items()
+        }
+    )
+
+
+def send(path: Path, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Send a request to a server and return the response (if any)."""
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(path))
+        except OSError:
+            return None
+
+        sock.sendall(json.dumps(request).encode() + b"\n")
+        sock.shutdown(socket.SHUT_WR)
+
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+
+    try:
+        return dict(json.loads(b"".join(chunks)))
+    except ValueError:
+        return None
+
+
+def forward(args: Namespace, path: Path = None) -> Optional[int]:
+    """
+    Attempt to run a command (from its parsed arguments) in a server process,
+    return the command's exit code (or None if the command should run in
+    this process instead).
+    """
+
+    if os.environ.get(NO_SERVER_ENV) or not hasattr(socket, "AF_UNIX"):
+        return None
+
+    if path is None:
+        path = socket_path()
+
+    if not path.is_socket():
+        return None
+
+    response = send(
+        path,
+        {
+            "version": VERSION,
+            "args": encode_args(args),
+            "cwd": os.getcwd(),
+            "env": dict(os.environ),
+        },
+    )
+
+    # The server may not be able to run the command (e.g. if it's a
+    # different version).
+    if response is None or response.get("code") is None:
+        return None
+
+    sys.stdout.write(response.get("stdout", ""))
+    sys.stdout.flush()
+    sys.stderr.write(response.get("stderr", ""))
+    sys.stderr.flush()
+
+    return int(response["code"])
@@ -1,7 +1,7 @@
 # =====================================
 # generator=datazen
 # version=3.1.4
-# hash=2b9927a9d538a17ed80c0411b8d02364
+# hash=eea2f75dc5e79cef99e59fcda6135685
 # =====================================
 
 """
@@ -17,7 +17,9 @@ from vcorelib.args import CommandRegister as _CommandRegister
 
 # internal
 from rcmpy.commands.apply import add_apply_cmd
+from rcmpy.commands.clean import add_clean_cmd
 from rcmpy.commands.dump import add_dump_cmd
+from rcmpy.commands.serve import add_serve_cmd
 from rcmpy.commands.use import add_use_cmd
 from rcmpy.commands.variant import add_variant_cmd
 from rcmpy.commands.watch import add_watch_cmd
@@ -32,11 +34,21 @@ def commands() -> _List[_Tuple[str, str, _CommandRegister]]:
             "apply any pending changes from the active data repository",
             add_apply_cmd,
         ),
+        (
+            "clean",
+            "remove cached and unused data",
+            add_clean_cmd,
+        ),
         (
             "dump",
             "dump template data to stdout as JSON",
             add_dump_cmd,
         ),
+        (
+            "serve",
+            "run commands for clients in a warm process",
+            add_serve_cmd,
+        ),
         (
             "use",
             "set the directory to use as the rcmpy data repository",
@@ -5,57 +5,228 @@ An entry-point for the 'apply' command.
 # built-in
 from argparse import ArgumentParser as _ArgumentParser
 from argparse import Namespace as _Namespace
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Set, Tuple
 
 # third-party
 from vcorelib.args import CommandFunction as _CommandFunction
 from vcorelib.paths import rel
 
 # internal
-from rcmpy.commands.common import run_env_command
-from rcmpy.environment import Environment
+from rcmpy.commands.common import add_trace_arg, forwarded, run_env_command
+from rcmpy.metrics import ApplyMetrics
+from rcmpy.paths.atomic import Durability
+from rcmpy.trace import span
 
+if TYPE_CHECKING:
+    # internal
+    from rcmpy.config import ManagedFile
+    from rcmpy.environment import Environment
+    from rcmpy.environment.template import EnvTemplate
+    from rcmpy.state.merkle import KeyPath
 
-def apply_env(args: _Namespace, env: Environment) -> int:
-    """Apply pending changes from the environment."""
 
-    result = 0
+def render_templates(
+    env: "Environment",
+    templates: "List[EnvTemplate]",
+    jobs: int = 1,
+    durability: Durability = Durability.NONE,
+) -> "List[Tuple[Path, Set[KeyPath], int]]":
+    """Render templates, optionally with a pool of worker threads."""
+
+    render = partial(env.render, durability=durability)
+
+    if jobs > 1 and len(templates) > 1:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            return list(pool.map(render, templates))
 
-    is_new = env.state.is_new()
+    return [render(x) for x in templates]
 
+
+def pending_files(
+    args: _Namespace, env: "Environment", metrics: ApplyMetrics = None
+) -> "Tuple[int, List[ManagedFile]]":
+    """
+    Determine which files need to be updated. Also return the number of
+    errors encountered.
+    """
+
+    if metrics is None:
+        metrics = ApplyMetrics()
+
+    result = 0
+    outputs = env.state.outputs
+
+    pending: List[ManagedFile] = []
     for file in env.config.files:
+        metrics.evaluated += 1
+
         # Check if a template is found for this file.
         if file.template not in env.templates_by_name:
             result += 1
+            metrics.missing_templates += 1
             env.logger.error("Template '%s' not found!", file.template)
             continue
 
+        if not file.platform:
+            metrics.skipped_platform += 1
+            continue
         if not file.evaluate(env.env_data):
+            metrics.skipped_condition += 1
             continue
 
-        # Check if this file has any updated templates.
-        if args.force or is_new or not file.present or env.is_updated(file):
-            template = env.templates_by_name[file.template]
+        # Skip this file if the fingerprint of its inputs hasn't changed
+        # (and the output is still intact).
+        previous = outputs.get(str(file.output))
+        dependencies = env.dependencies(env.templates_by_name[file.template])
+        if (
+            not args.force
+            and file.present
+            and file.exec_current
+            and previous is not None
+            and dependencies is not None
+        ):
+            if env.fingerprint(file, dependencies) == previous["fingerprint"]:
+                metrics.unchanged += 1
+                continue
 
-            # If a template doesn't require rendering, use it as-is.
-            source = template.path
+        pending.append(file)
 
-            if template.template is not None:
-                # Render the template to the build directory.
-                source = env.build.joinpath(file.template)
-                with source.open("w") as path_fd:
-                    path_fd.write(template.template.render(env.template_data))
-                    env.logger.info("Rendered '%s'.", rel(source))
+    return result, pending
 
-            # Update the output file.
-            if not args.dry_run:
-                file.update(source, env.logger)
 
+def apply_env(args: _Namespace, env: "Environment") -> int:
+    """Apply pending changes from the environment."""
+
+    metrics = ApplyMetrics()
+    metrics.load_phases()
+    with metrics.phase("apply"):
+        result = apply_pending(args, env, metrics)
+
+    metrics.write(
+        getattr(args, "metrics", None), getattr(args, "prometheus", None)
+    )
     return result
 
 
+def apply_pending(
+    args: _Namespace, env: "Environment", metrics: ApplyMetrics
+) -> int:
+    """Render templates and update the output files that are out-of-date."""
+
+    durability = Durability(args.durability)
+
+    with span("pending"), metrics.phase("pending"):
+        result, pending = pending_files(args, env, metrics)
+
+    # Render each template that's needed once (the output of a template only
+    # depends on template data).
+    templates: Dict[str, EnvTemplate] = {}
+    for file in pending:
+        template = env.templates_by_name[file.template]
+        if template.is_template:
+            templates.setdefault(template.name, template)
+
+    with span("render_all", count=len(templates)), metrics.phase("render"):
+        results = render_templates(
+            env,
+            list(templates.values()),
+            jobs=args.jobs,
+            durability=durability,
+        )
+
+    rendered: Dict[str, Tuple[Path, Set[KeyPath]]] = {}
+    for template, (source, reads, written) in zip(templates.values(), results):
+        env.set_dependencies(template, reads)
+        env.logger.info("Rendered '%s' (%s).", template.name, rel(source))
+        rendered[template.name] = (source, reads)
+        metrics.bytes_written += written
+    metrics.rendered = len(rendered)
+
+    # Update output files.
+    if not args.dry_run:
+        with span("update", count=len(pending)), metrics.phase("update"):
+            update_outputs(env, pending, rendered, durability, metrics)
+
+    return result
+
+
+def update_outputs(
+    env: "Environment",
+    pending: "List[ManagedFile]",
+    rendered: "Dict[str, Tuple[Path, Set[KeyPath]]]",
+    durability: Durability,
+    metrics: ApplyMetrics,
+) -> None:
+    """Update output files (and their entries in state)."""
+
+    outputs = env.state.outputs
+
+    for file in pending:
+        # If a template doesn't require rendering, use it as-is.
+        source, reads = rendered.get(
+            file.template,
+            (env.templates_by_name[file.template].path, set()),
+        )
+        if not file.update(source, env.logger, durability=durability):
+            metrics.unchanged += 1
+        elif file.link:
+            metrics.linked += 1
+        else:
+            metrics.copied += 1
+            metrics.bytes_written += source.stat().st_size
+
+        entry = {"fingerprint": env.fingerprint(file, reads)}
+        if file.template in rendered:
+            entry["blob"] = source.name
+        outputs[str(file.output)] = entry
+
+    # Don't keep fingerprints for files that are no longer managed.
+    managed = set(str(x.output) for x in env.config.files)
+    for key in set(outputs) - managed:
+        del outputs[key]
+
+
+def apply_watch(args: _Namespace, env: "Environment") -> int:
+    """
+    Apply pending changes from the environment, then keep the environment
+    loaded and apply changes again whenever its data repository changes.
+    """
+
+    # Only watching requires the event loop (and file-system monitoring).
+    # pylint: disable=import-outside-toplevel
+    from asyncio import Event, get_event_loop
+
+    from vcorelib.asyncio import run_handle_stop
+
+    from rcmpy.watch.environment import watch_environment
+
+    result = apply_env(args, env)
+
+    stop_sig = Event()
+    return result + run_handle_stop(
+        stop_sig,
+        watch_environment(stop_sig, env, partial(apply_env, args, env)),
+        eloop=get_event_loop(),
+    )
+
+
+@forwarded
+def apply_once(args: _Namespace) -> int:
+    """Apply changes once."""
+    return run_env_command(args, apply_env)
+
+
 def apply_cmd(args: _Namespace) -> int:
     """Execute the apply command."""
-    return run_env_command(args, apply_env)
+
+    # Watching runs indefinitely, so it's never forwarded to a server.
+    if args.watch:
+        return run_env_command(args, apply_watch)
+
+    return apply_once(args)
 
 
 def add_apply_cmd(parser: _ArgumentParser) -> _CommandFunction:
@@ -65,7 +236,10 @@ def add_apply_cmd(parser: _ArgumentParser) -> _CommandFunction:
         "-f",
         "--force",
         action="store_true",
-        help="whether or not to forcibly render all outputs",
+        help=(
+            "whether or not to forcibly render all outputs (even if the "
+            "fingerprint of their inputs hasn't changed)"
+        ),
     )
     parser.add_argument(
         "-d",
@@ -73,5 +247,49 @@ def add_apply_cmd(parser: _ArgumentParser) -> _CommandFunction:
         action="store_true",
         help="whether or not to update output files",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help=(
+            "number of templates to render concurrently "
+            "(default: %(default)s)"
+        ),
+    )
+    parser.add_argument(
+        "-w",
+        "--watch",
+        action="store_true",
+        help=(
+            "keep running and apply changes whenever the data "
+            "repository changes"
+        ),
+    )
+    parser.add_argument(
+        "--durability",
+        choices=[x.value for x in Durability],
+        default=Durability.NONE.value,
+        help=(
+            "how much to synchronize output files to disk, they're always "
+            "replaced atomically (default: %(default)s)"
+        ),
+    )
+
+    parser.add_argument(
+        "--metrics",
+        type=Path,
+        help="write metrics about each application of changes (JSON)",
+    )
+    parser.add_argument(
+        "--prometheus",
+        type=Path,
+        help=(
+            "write metrics about each application of changes (Prometheus "
+            "textfile-collector format)"
+        ),
+    )
+
+    add_trace_arg(parser)
 
     return apply_cmd
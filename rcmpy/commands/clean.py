@@ -0,0 +1,70 @@
+"""
+An entry-point for the 'clean' command.
+"""
+
+# built-in
+from argparse import ArgumentParser as _ArgumentParser
+from argparse import Namespace as _Namespace
+from logging import getLogger
+
+# third-party
+from vcorelib.args import CommandFunction as _CommandFunction
+
+# internal
+from rcmpy.commands.common import forwarded
+
+
+@forwarded
+def clean_cmd(args: _Namespace) -> int:
+    """Execute the clean command."""
+
+    # pylint: disable=import-outside-toplevel
+    from rcmpy.paths.blobs import blob_root, collect_garbage
+    from rcmpy.paths.cache import clean_stale_caches, purge_bytecode_cache
+    from rcmpy.state import load_state
+
+    logger = getLogger(__name__)
+
+    # Clean everything if nothing specific was requested.
+    everything = not args.templates and not args.blobs and not args.watch
+
+    if everything or args.templates:
+        purge_bytecode_cache(logger)
+
+    if everything or args.blobs:
+        with load_state() as state:
+            collect_garbage(
+                blob_root(state.directory.joinpath("build")),
+                set(x["blob"] for x in state.outputs.values() if "blob" in x),
+                logger,
+            )
+
+    if everything or args.watch:
+        clean_stale_caches(logger)
+
+    return 0
+
+
+def add_clean_cmd(parser: _ArgumentParser) -> _CommandFunction:
+    """Add clean-command arguments to its parser."""
+
+    parser.add_argument(
+        "-t",
+        "--templates",
+        action="store_true",
+        help="remove compiled templates",
+    )
+    parser.add_argument(
+        "-b",
+        "--blobs",
+        action="store_true",
+        help="remove rendered outputs that no managed file uses",
+    )
+    parser.add_argument(
+        "-w",
+        "--watch",
+        action="store_true",
+        help="remove file-information caches left behind by watch tasks",
+    )
+
+    return clean_cmd
@@ -5,14 +5,22 @@ A module for common argument-parsing methods.
 # built-in
 from argparse import ArgumentParser as _ArgumentParser
 from argparse import Namespace as _Namespace
+from functools import wraps
 from logging import getLogger
-from typing import Callable
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
 
 # third-party
+from vcorelib.args import CommandFunction as _CommandFunction
 from vcorelib.logging import log_time
 
 # internal
-from rcmpy.environment import Environment, load_environment
+from rcmpy.client import forward
+from rcmpy.trace import span, traced
+
+if TYPE_CHECKING:
+    # internal
+    from rcmpy.environment import Environment
 
 
 def add_default_flag(parser: _ArgumentParser) -> None:
@@ -26,17 +34,53 @@ def add_default_flag(parser: _ArgumentParser) -> None:
     )
 
 
-EnvCommand = Callable[[_Namespace, Environment], int]
+def add_trace_arg(parser: _ArgumentParser) -> None:
+    """Adds an argument for writing a trace of the command's phases."""
+
+    parser.add_argument(
+        "--trace",
+        type=Path,
+        help="write a Chrome trace-event file of the command's phases",
+    )
+
+
+def forwarded(cmd: _CommandFunction) -> _CommandFunction:
+    """
+    Run a command in a server process instead of this one (if a server is
+    available).
+    """
+
+    @wraps(cmd)
+    def run(args: _Namespace) -> int:
+        """Run the command (in a server process if possible)."""
+
+        result = forward(args)
+        return cmd(args) if result is None else result
+
+    return run
+
+
+EnvCommand = Callable[[_Namespace, "Environment"], int]
 
 
 def run_env_command(args: _Namespace, cmd: EnvCommand) -> int:
     """Run a command with the environment instance loaded."""
 
+    # Only commands that use the environment should import it.
+    # pylint: disable=import-outside-toplevel
+    from rcmpy.environment import load_environment
+
     result = 1
 
-    with log_time(getLogger(__name__), "Command"):
-        with load_environment() as env:
-            if env.config_loaded:
-                result = cmd(args, env)
+    # Span totals are needed to report how long loading phases take.
+    totals = any(
+        getattr(args, x, None) is not None for x in ("metrics", "prometheus")
+    )
+
+    with traced(getattr(args, "trace", None), totals=totals):
+        with log_time(getLogger(__name__), "Command"), span(args.command):
+            with load_environment() as env:
+                if env.config_loaded:
+                    result = cmd(args, env)
 
     return result
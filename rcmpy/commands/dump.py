@@ -7,28 +7,35 @@ from argparse import ArgumentParser as _ArgumentParser
 from argparse import Namespace as _Namespace
 from json import dump
 import sys
+from typing import TYPE_CHECKING
 
 # third-party
 from vcorelib.args import CommandFunction as _CommandFunction
 
 # internal
-from rcmpy.commands.common import run_env_command
-from rcmpy.environment import Environment
+from rcmpy.commands.common import add_trace_arg, forwarded, run_env_command
 
+if TYPE_CHECKING:
+    # internal
+    from rcmpy.environment import Environment
 
-def dump_env(_: _Namespace, env: Environment) -> int:
+
+def dump_env(_: _Namespace, env: "Environment") -> int:
     """Dump information about the environment."""
 
     dump(env.template_data, sys.stdout, indent=2, sort_keys=True)
     return 0
 
 
+@forwarded
 def dump_cmd(args: _Namespace) -> int:
     """Execute the dump command."""
     return run_env_command(args, dump_env)
 
 
-def add_dump_cmd(_: _ArgumentParser) -> _CommandFunction:
+def add_dump_cmd(parser: _ArgumentParser) -> _CommandFunction:
     """Add dump-command arguments to its parser."""
 
+    add_trace_arg(parser)
+
     return dump_cmd
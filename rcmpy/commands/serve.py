@@ -0,0 +1,59 @@
+"""
+An entry-point for the 'serve' command.
+"""
+
+# built-in
+from argparse import ArgumentParser as _ArgumentParser
+from argparse import Namespace as _Namespace
+from contextlib import suppress
+from logging import getLogger
+import socket
+
+# third-party
+from vcorelib.args import CommandFunction as _CommandFunction
+from vcorelib.paths import rel
+
+# internal
+from rcmpy.client import socket_path
+
+
+def serve_cmd(args: _Namespace) -> int:
+    """Execute the serve command."""
+
+    logger = getLogger(__name__)
+
+    # The server (and its dependencies) are only available with Unix
+    # sockets.
+    if not hasattr(socket, "AF_UNIX"):
+        logger.error("Serving requires Unix sockets (not available here).")
+        return 1
+
+    # pylint: disable=import-outside-toplevel
+    from rcmpy.server import Server, server_running
+
+    path = socket_path()
+    if server_running(path):
+        logger.error("A server is already running on '%s'.", rel(path))
+        return 1
+
+    with Server(path) as server, suppress(KeyboardInterrupt):
+        server.serve(logger, idle=args.idle)
+
+    return 0
+
+
+def add_serve_cmd(parser: _ArgumentParser) -> _CommandFunction:
+    """Add serve-command arguments to its parser."""
+
+    parser.add_argument(
+        "-i",
+        "--idle",
+        type=float,
+        default=0.0,
+        help=(
+            "exit after this many seconds without a request, zero means "
+            "never (default: %(default)s)"
+        ),
+    )
+
+    return serve_cmd
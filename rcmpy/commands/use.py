@@ -11,14 +11,17 @@ from pathlib import Path
 from vcorelib.args import CommandFunction as _CommandFunction
 
 # internal
-from rcmpy.commands.common import add_default_flag
+from rcmpy.commands.common import add_default_flag, forwarded
 from rcmpy.paths import default_config_directory
-from rcmpy.state import load_state
 
 
+@forwarded
 def use_cmd(args: _Namespace) -> int:
     """Execute the use command."""
 
+    # pylint: disable=import-outside-toplevel
+    from rcmpy.state import load_state
+
     with load_state() as state:
         if args.default:
             args.directory = default_config_directory()
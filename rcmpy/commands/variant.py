@@ -10,13 +10,16 @@ from argparse import Namespace as _Namespace
 from vcorelib.args import CommandFunction as _CommandFunction
 
 # internal
-from rcmpy.commands.common import add_default_flag
-from rcmpy.state import load_state
+from rcmpy.commands.common import add_default_flag, forwarded
 
 
+@forwarded
 def variant_cmd(args: _Namespace) -> int:
     """Execute the variant command."""
 
+    # pylint: disable=import-outside-toplevel
+    from rcmpy.state import load_state
+
     with load_state() as state:
         if args.default:
             args.variant = "default"
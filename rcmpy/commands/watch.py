@@ -5,18 +5,50 @@ An entry-point for the 'watch' command.
 # built-in
 from argparse import ArgumentParser as _ArgumentParser
 from argparse import Namespace as _Namespace
+from logging import getLogger
 
 # third-party
 from vcorelib.args import CommandFunction as _CommandFunction
 
 # internal
-from rcmpy.watch import watch
 from rcmpy.watch.params import WatchParams
 
 
 def watch_cmd(args: _Namespace) -> int:
     """Execute the watch command."""
 
+    # pylint: disable=import-outside-toplevel
+    from rcmpy.watch.config import WatchConfig
+    from rcmpy.watch.task import watch
+
+    logger = getLogger(__name__)
+
+    if args.config is not None:
+        # Rather than silently ignoring options, reject them (rules set
+        # them instead).
+        conflicts = WatchParams.config_conflicts(args)
+        if conflicts:
+            logger.error(
+                "Can't use %s with '--config' (set them in '%s' instead).",
+                ", ".join(f"'{x}'" for x in conflicts),
+                args.config,
+            )
+            return 1
+
+        config = WatchConfig.load(args.config)
+        return watch(
+            *config.params(
+                args.config.parent, args.dir, single_pass=args.single_pass
+            ),
+            jobs=config.jobs,
+        )
+
+    if args.directory is None or not args.cmd:
+        logger.error(
+            "A directory and command are required (without '--config')."
+        )
+        return 1
+
     return watch(WatchParams.from_args(args))
 
 
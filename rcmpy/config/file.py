@@ -3,17 +3,29 @@ A module implementing an interface for package-managed files.
 """
 
 # built-in
-from contextlib import suppress
 from dataclasses import dataclass
+from filecmp import cmp
+from functools import lru_cache
+import os
 from pathlib import Path
 from shutil import copyfile
 import sys
+from types import CodeType
 from typing import Any, Dict, Set
 
 # third-party
 from vcorelib.logging import LoggerType
 from vcorelib.paths import rel, set_exec_flags
 
+# internal
+from rcmpy.paths.atomic import Durability, staged
+
+
+@lru_cache(maxsize=None)
+def compile_condition(condition: str) -> CodeType:
+    """Compile a condition (only once for each distinct condition)."""
+    return compile(condition, "<condition>", "eval")
+
 
 @dataclass
 class ManagedFile:
@@ -52,7 +64,7 @@ class ManagedFile:
     def evaluate(self, env: Dict[str, Any]) -> bool:
         """Determine if this file should be handled."""
         return self.platform and eval(  # pylint: disable=eval-used
-            self.condition, None, env
+            compile_condition(self.condition), None, env
         )
 
     def update_root(self, root: Path) -> None:
@@ -65,24 +77,69 @@ class ManagedFile:
             self.directory = root.joinpath(self.directory)
             assert self.directory.is_absolute(), self.directory
 
-    def update(self, source: Path, logger: LoggerType) -> None:
-        """Update this managed file based on the provided source file."""
+    @property
+    def exec_current(self) -> bool:
+        """
+        Determine if the output file's executable bits are set (respecting
+        'read' bits) as updating it would set them. Copies that aren't
+        executable shouldn't have any executable bits set.
+        """
+
+        mode = self.output.stat().st_mode
+        if self.executable:
+            return mode & ((mode & 0o444) >> 2) == (mode & 0o444) >> 2
+        return self.link or not mode & 0o111
+
+    def is_current(self, source: Path) -> bool:
+        """
+        Determine if the output file is already what updating it (based on
+        the provided source file) would produce.
+        """
 
         output = self.output
 
-        # At some point this could be skipped for existing symlinks.
-        with suppress(FileNotFoundError):
-            output.unlink()
+        if self.link:
+            if not output.is_symlink() or Path(os.readlink(output)) != source:
+                return False
+        elif (
+            output.is_symlink()
+            or not output.is_file()
+            or not cmp(source, output, shallow=False)
+        ):
+            return False
+
+        return self.exec_current
+
+    def update(
+        self,
+        source: Path,
+        logger: LoggerType,
+        durability: Durability = Durability.NONE,
+    ) -> bool:
+        """
+        Update this managed file based on the provided source file. Return
+        whether or not the output file was changed. The output file is
+        replaced atomically.
+        """
+
+        output = self.output
+
+        # Don't touch outputs that are already correct.
+        if self.is_current(source):
+            logger.debug("'%s' is up-to-date.", rel(output))
+            return False
 
         # Ensure the output directory exists.
         self.directory.mkdir(parents=True, exist_ok=True)
 
-        if self.link:
-            output.symlink_to(source)
-        else:
-            copyfile(source, output)
+        with staged(output, durability) as tmp:
+            if self.link:
+                tmp.symlink_to(source)
+            else:
+                copyfile(source, tmp)
 
-        if self.executable:
-            set_exec_flags(output)
+            if self.executable:
+                set_exec_flags(tmp)
 
         logger.info("'%s' -> '%s'.", rel(source), rel(output))
+        return True
@@ -4,19 +4,79 @@ A module implementing the package's runtime environment.
 
 # built-in
 from contextlib import ExitStack, contextmanager
-from typing import Iterator
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Set
 
 # third-party
 from vcorelib.paths import Pathlike
 
 # internal
+from rcmpy import PKG_NAME
 from rcmpy.environment.template import TemplateEnvironment
 from rcmpy.state import load_state
 
+# Data-repository directories that environments are loaded from.
+SOURCE_DIRECTORIES = {"templates", "variables", "configs", "includes"}
+
+
+def source_kind(root: Path, path: Path) -> str:
+    """
+    Determine which kind of environment source a path in a data repository
+    is (an empty string if it isn't one).
+    """
+
+    try:
+        parts = path.relative_to(root).parts
+    except ValueError:
+        return ""
+
+    if parts and parts[0] in SOURCE_DIRECTORIES:
+        return parts[0]
+
+    # The manifest is handled the same way as includes.
+    if len(parts) == 1 and Path(parts[0]).stem == PKG_NAME:
+        return "includes"
+
+    return ""
+
 
 class Environment(TemplateEnvironment):
     """A class implementing this package's runtime environment."""
 
+    def refresh(self, changed: Iterable[Path]) -> Set[str]:
+        """
+        Update this environment based on changed files in the data
+        repository. Return the kinds of sources that changed.
+        """
+
+        by_kind: Dict[str, Set[Path]] = {}
+        for path in changed:
+            by_kind.setdefault(
+                source_kind(self.state.directory, path), set()
+            ).add(path)
+
+        by_kind.pop("", None)
+        kinds = set(by_kind)
+
+        # Check indexed files against the file system again.
+        if kinds:
+            self.state.decoded.index.invalidate()
+
+        if "variables" in kinds or "configs" in kinds:
+            self.state.reload(variables="variables" in kinds)
+            self.init_template_data()
+
+        if "includes" in kinds:
+            self.reload_config()
+
+        if "templates" in kinds:
+            self.reload_templates(by_kind["templates"])
+
+        if kinds:
+            self.logger.info("Refreshed %s.", ", ".join(sorted(kinds)))
+
+        return kinds
+
 
 @contextmanager
 def load_environment(
@@ -5,7 +5,7 @@ A module implementing a basic environment interface.
 # built-in
 from contextlib import ExitStack
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 # third-party
 from vcorelib.io import ARBITER
@@ -14,14 +14,15 @@ from vcorelib.logging import LoggerMixin, LoggerType
 from vcorelib.paths import Pathlike, normalize, rel
 
 # internal
-from rcmpy import PKG_NAME
+from rcmpy import PKG_NAME, VERSION
 from rcmpy.config import Config
 from rcmpy.paths import default_cache_directory
 from rcmpy.state import State
+from rcmpy.trace import span
 
 
 def load_if_single_candidate(
-    path: Pathlike, logger: LoggerType = None
+    path: Pathlike, logger: LoggerType = None, files_loaded: List[Path] = None
 ) -> Optional[LoadResult]:
     """
     Attempt to load a configuration file if a candidate exists at the given
@@ -46,6 +47,7 @@ def load_if_single_candidate(
             config_candidates[0],
             includes_key="includes",
             expect_overwrite=True,
+            files_loaded=files_loaded,
         )
         if logger is not None:
             logger.info("Loaded config '%s'.", rel(config_candidates[0]))
@@ -53,20 +55,32 @@ def load_if_single_candidate(
     return result
 
 
+def manifest_candidates(root: Path, variant: str) -> List[Path]:
+    """Get all paths that manifest data could be loaded from."""
+
+    return [
+        *FileExtension.data_candidates(root.joinpath(PKG_NAME)),
+        *FileExtension.data_candidates(root.joinpath("includes", variant)),
+    ]
+
+
 def load_manifest(
-    root: Path, variant: str, logger: LoggerType
+    root: Path,
+    variant: str,
+    logger: LoggerType,
+    files_loaded: List[Path] = None,
 ) -> Optional[LoadResult]:
     """Load the top-level data repository configuration."""
 
     # Attempt to load the base manifest.
     config_data = load_if_single_candidate(
-        root.joinpath(PKG_NAME), logger=logger
+        root.joinpath(PKG_NAME), logger=logger, files_loaded=files_loaded
     )
 
     if config_data is not None:
         # Attempt to load variant-specific manifest data.
         variant_data = load_if_single_candidate(
-            root.joinpath("includes", variant)
+            root.joinpath("includes", variant), files_loaded=files_loaded
         )
         if variant_data is not None:
             config_data.merge(variant_data, expect_overwrite=True)
@@ -89,19 +103,9 @@ class BaseEnvironment(LoggerMixin):
         self.build = state.directory.joinpath("build")
         self.build.mkdir(exist_ok=True)
 
-        config_data = load_manifest(
-            state.directory, state.variant, self.logger
-        )
-        if config_data is not None:
-            self._config = Config(data=config_data.data)
-
-            # Ensure that any relative paths called out are relative to the
-            # root directory of the data repository.
-            self._config.update_root(state.directory)
-
-            # Treat manifest changes as criteria for updating outputs.
-            self.state.update_manifest(self._config.data)
-
+        with span("manifest"):
+            self._config = self._load_config()
+        if self._config is not None:
             # Consider the config not loaded if initialization fails.
             #
             # **Add this back in if initialization can actually fail.**
@@ -109,7 +113,59 @@ class BaseEnvironment(LoggerMixin):
             # if not self._init_loaded():
             #     self.logger.info("Initialization failed!")
             #     self._config = None
-            assert self._init_loaded()
+            with span("init"):
+                assert self._init_loaded()
+
+    def _load_config(self) -> Optional[Config]:
+        """Load the data repository's configuration (if there is one)."""
+
+        config = None
+
+        root = self.state.directory
+        variant = self.state.variant
+
+        def decode(loaded: List[Path]) -> Optional[LoadResult]:
+            """Load and validate the manifest."""
+
+            result = load_manifest(
+                root, variant, self.logger, files_loaded=loaded
+            )
+            if result is not None:
+                with span("validate"):
+                    result = LoadResult(
+                        Config(data=result.data).data,
+                        result.success,
+                        result.time_ns,
+                    )
+            return result
+
+        # Cache validated data (validation depends on this package's
+        # version) so that it's only validated when the manifest changes.
+        config_data = self.state.decoded.load(
+            f"manifest:{root}:{variant}",
+            decode,
+            candidates=manifest_candidates(root, variant),
+            salt=VERSION,
+        )
+        if config_data is not None:
+            config = Config(data=config_data.data, validate=False)
+
+            # Ensure that any relative paths called out are relative to the
+            # root directory of the data repository.
+            config.update_root(self.state.directory)
+
+        return config
+
+    def reload_config(self) -> bool:
+        """
+        Load the data repository's configuration again, return False (and
+        keep the current configuration) if it can't be loaded.
+        """
+
+        config = self._load_config()
+        if config is not None:
+            self._config = config
+        return config is not None
 
     def _init_loaded(self) -> bool:
         """Called during initialization if a valid configuration is loaded."""
@@ -0,0 +1,80 @@
+"""
+A module implementing a persistent cache for compiled templates.
+"""
+
+# built-in
+from pathlib import Path
+from threading import Lock
+
+# third-party
+from jinja2 import FileSystemBytecodeCache
+from jinja2 import __version__ as JINJA_VERSION
+from jinja2.bccache import Bucket
+from vcorelib.logging import LoggerType
+
+# internal
+from rcmpy import VERSION
+from rcmpy.paths.cache import bytecode_cache_root
+
+
+def bytecode_cache_directory(root: Path = None) -> Path:
+    """
+    Get the directory to cache compiled templates in. Cached templates are
+    only re-used by the same version of this package and Jinja.
+    """
+
+    if root is None:
+        root = bytecode_cache_root()
+
+    path = root.joinpath(f"{VERSION}-jinja{JINJA_VERSION}")
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+class TemplateBytecodeCache(FileSystemBytecodeCache):
+    """
+    A file-system bytecode cache that keeps track of cache-usage statistics.
+    Cache entries are keyed by template name and path, and are only used if
+    the checksum of the template's source still matches.
+    """
+
+    def __init__(self, directory: Path = None) -> None:
+        """Initialize this instance."""
+
+        if directory is None:
+            directory = bytecode_cache_directory()
+
+        super().__init__(str(directory))
+
+        # Templates may be loaded from multiple threads.
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def load_bytecode(self, bucket: Bucket) -> None:
+        """Load bytecode for a bucket (if a valid entry exists)."""
+
+        super().load_bytecode(bucket)
+        with self.lock:
+            if bucket.code is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+    def dump_bytecode(self, bucket: Bucket) -> None:
+        """Write bytecode for a bucket."""
+
+        super().dump_bytecode(bucket)
+        with self.lock:
+            self.writes += 1
+
+    def log_stats(self, logger: LoggerType) -> None:
+        """Log cache-usage statistics."""
+
+        logger.info(
+            "Template cache: %d hit(s), %d miss(es), %d written.",
+            self.hits,
+            self.misses,
+            self.writes,
+        )
@@ -4,31 +4,60 @@ An environment extension for working with template files.
 
 # built-in
 from copy import copy
+from json import dumps
 from pathlib import Path
-from typing import Dict, NamedTuple, Optional, Set, Tuple
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    cast,
+)
 
 # third-party
 from datazen.templates import environment
 from jinja2 import Environment, FileSystemLoader, Template
-from vcorelib.paths.info import FileChangeEvent
-from vcorelib.paths.info_cache import FileChanged, file_info_cache
+from vcorelib.dict.cache import FileCache
+from vcorelib.paths import str_md5_hex
 
 # internal
 from rcmpy.config import ManagedFile
 from rcmpy.environment.base import BaseEnvironment
+from rcmpy.environment.bytecode import TemplateBytecodeCache
 from rcmpy.environment.data import system_data
+from rcmpy.environment.tracking import (
+    TrackingContext,
+    minimize,
+    resolve,
+    track_reads,
+)
+from rcmpy.paths.atomic import Durability
+from rcmpy.paths.blobs import blob_root, store_blob
+from rcmpy.state.merkle import KeyPath
+from rcmpy.trace import span
 
 
 class EnvTemplate(NamedTuple):
     """
-    A data structure for keeping track of environment templates. If 'template'
+    A data structure for keeping track of environment templates. If 'source'
     is None, it signals that the template does not require rendering.
+    Otherwise it's the name the template can be loaded by (compilation is
+    deferred until the template is actually rendered).
     """
 
     name: str
     path: Path
     subdir: str
-    template: Optional[Template] = None
+    source: Optional[str] = None
+
+    @property
+    def is_template(self) -> bool:
+        """Determine if this template requires rendering."""
+        return self.source is not None
 
 
 def template_name(name: str) -> Tuple[bool, str]:
@@ -52,111 +81,215 @@ class TemplateEnvironment(BaseEnvironment):
     templates: Dict[Path, EnvTemplate]
     templates_by_name: Dict[str, EnvTemplate]
     jinja: Environment
+    bytecode: TemplateBytecodeCache
+    template_dependencies: Dict[str, List[List[str]]]
+    template_data: Dict[str, Any]
+
+    def template_digest(self, name: str) -> str:
+        """
+        Get a digest for a template (based on the path and contents of the
+        template file that would be used).
+        """
 
-    def is_updated(self, file: ManagedFile) -> bool:
+        digest = self.template_digests.get(name)
+        if digest is None:
+            template = self.templates_by_name.get(name)
+            digest = "missing"
+            if template is not None:
+                digest = (
+                    f"{template.path}:"
+                    f"{self.state.decoded.index.digest(template.path)}"
+                )
+            self.template_digests[name] = digest
+
+        return digest
+
+    def dependencies(self, template: EnvTemplate) -> Optional[List[KeyPath]]:
         """
-        Determine if a managed file is updated or not (based on template
-        changes).
+        Get the key paths of template data that a template read the last
+        time it was rendered (None if this isn't known).
         """
-        return file.template in self.updated_template_names or any(
-            x in self.updated_template_names for x in file.extra_templates
+
+        if not template.is_template:
+            return []
+
+        paths = self.template_dependencies.get(str(template.path))
+        if paths is None:
+            return None
+
+        return [tuple(x) for x in paths]
+
+    def set_dependencies(
+        self, template: EnvTemplate, paths: Iterable[KeyPath]
+    ) -> None:
+        """Set the key paths of template data that a template reads."""
+
+        self.template_dependencies[str(template.path)] = [
+            list(x) for x in minimize(paths)
+        ]
+
+    def fingerprint(self, file: ManagedFile, paths: Iterable[KeyPath]) -> str:
+        """
+        Compute a fingerprint for the inputs of a managed file: its template
+        sources, its output options and the values of the template data (by
+        key path) that rendering it reads.
+        """
+
+        data = []
+        for path in minimize(paths):
+            found, value = resolve(self.template_data, path)
+            if found:
+                data.append([list(path), value])
+
+        return str_md5_hex(
+            dumps(
+                {
+                    "templates": [
+                        self.template_digest(x)
+                        for x in [file.template, *sorted(file.extra_templates)]
+                    ],
+                    "link": file.link,
+                    "executable": file.executable,
+                    "data": data,
+                },
+                sort_keys=True,
+                default=str,
+            )
         )
 
+    def init_template_data(self) -> None:
+        """Create template data from the current configuration data."""
+
+        self.template_data = copy(self.state.configs)
+        assert "env" not in self.template_data
+        self.template_data["env"] = self.env_data
+
+    def reload_templates(self, changed: Iterable[Path] = ()) -> None:
+        """
+        Update template information after template files change. Compiled
+        templates are discarded if their source changed (or all of them, if
+        the set of templates changed).
+        """
+
+        previous = dict(self.templates)
+        self._load_templates()
+        self.template_digests.clear()
+
+        cache = self.jinja.cache
+        if cache is not None:
+            if previous != self.templates:
+                cache.clear()
+            else:
+                paths = set(changed)
+                for key, template in list(cache.items()):
+                    if (
+                        template.filename is not None
+                        and Path(template.filename).resolve() in paths
+                    ):
+                        del cache[key]
+
+    def compile(self, template: EnvTemplate) -> Optional[Template]:
+        """
+        Get the compiled version of a template (if it requires rendering).
+        Compilation only happens the first time a template is requested.
+        """
+
+        if template.source is None:
+            return None
+
+        return self.jinja.get_template(template.source)
+
+    def render(
+        self, template: EnvTemplate, durability: Durability = Durability.NONE
+    ) -> Tuple[Path, Set[KeyPath], int]:
+        """
+        Render a template to a content-addressed blob in the build directory
+        (identical content is only stored once). Return the path to the
+        result, the key paths of template data that were read and the number
+        of bytes written (templates that don't require rendering are used
+        as-is).
+        """
+
+        with span("render", template=template.name):
+            with span("compile"):
+                compiled = self.compile(template)
+            if compiled is None:
+                return template.path, set(), 0
+
+            with track_reads() as reads:
+                content = compiled.render(self.template_data)
+
+            with span("store"):
+                path, written = store_blob(
+                    blob_root(self.build), content, durability
+                )
+
+        return path, reads, written
+
     def _load_templates(self) -> None:
         """Load template information to the environment."""
 
-        # Keep track of templates by name.
-        self.templates = {}
-        self.templates_by_name = {}
-        for name in self.jinja.list_templates():
-            obj = self.jinja.get_template(name)
+        loader = self.jinja.loader
+        assert isinstance(loader, FileSystemLoader)
 
-            # We know all templates are files.
-            assert obj.filename is not None
+        # Search paths are in precedence order, only the first occurrence of
+        # a given template name is what the loader would find.
+        sources: Dict[str, Path] = {}
+        for searchpath in loader.searchpath:
+            directory = Path(searchpath)
+            for path in self.state.decoded.index.files_in(directory):
+                sources.setdefault(
+                    path.relative_to(directory).as_posix(), path
+                )
 
-            is_template, name = template_name(name)
+        # Keep track of templates by name (without compiling them).
+        self.templates = {}
+        self.templates_by_name = {}
+        for source in sorted(sources):
+            is_template, name = template_name(source)
 
             # Keep track of template paths and their templates.
-            path = Path(obj.filename).resolve()
+            path = sources[source].resolve()
 
             new = EnvTemplate(
                 name,
                 path,
                 path.parent.name,
-                obj if is_template else None,
+                source if is_template else None,
             )
             self.templates[path] = new
             self.templates_by_name[name] = new
 
-    def _init_templates(self, template_names: Set[str]) -> bool:
-        """
-        Initialize the template environment based on a set of template names
-        that may be relevant to some task.
-        """
+    def _init_templates(self) -> bool:
+        """Initialize the template environment."""
 
         # The variant's template directory takes precedence.
         candidates = self.state.root_directories(
             "templates", common_first=False
         )
 
+        # Compiled templates persist across invocations.
+        self.bytecode = TemplateBytecodeCache()
+        self.stack.callback(self.bytecode.log_stats, self.logger)
+
         # Prefer variant templates, if the variant template-directory
         # exists.
         self.jinja = environment(
-            loader=FileSystemLoader(candidates, followlinks=True)
+            loader=FileSystemLoader(candidates, followlinks=True),
+            bytecode_cache=self.bytecode,
         )
 
-        self._load_templates()
-
-        def poll_cb(change: FileChanged) -> bool:
-            """Aggregate paths of templates that have been updated."""
-
-            if change.event is not FileChangeEvent.REMOVED:
-                assert change.new is not None
-                path = change.new.path
-
-                subdir = path.parent.name
-                _, name = template_name(path.name)
-
-                # Don't acknowledge changes to any files that aren't active
-                # templates.
-                if (
-                    name not in template_names
-                    or name not in self.templates_by_name
-                ):
-                    return False
-
-                template = self.templates_by_name[name]
-
-                # If a version of a template that's not currently used has
-                # changed, don't acknowledge the change either.
-                if subdir != template.subdir:
-                    return False
-
-                self.updated_templates.add(path)
-                self.updated_template_names.add(self.templates[path].name)
-
-            return True
-
-        template_changes = self.stack.enter_context(
-            file_info_cache(
-                self._cache.joinpath("templates.json"),
-                poll_cb,
-                logger=self.logger,
-            )
+        # Allow recording which template data gets read during rendering.
+        self.jinja.context_class = TrackingContext
+        self.template_dependencies = cast(
+            Dict[str, List[List[str]]],
+            self.stack.enter_context(
+                FileCache(self._cache.joinpath("dependencies.json")).loaded()
+            ),
         )
 
-        # Poll template directories.
-        for candidate in candidates:
-            template_changes.poll_directory(candidate)
-
-        # Log info about detected template changes.
-        for changed in self.updated_templates:
-            template = self.templates[changed]
-            self.logger.info(
-                "Detected change for template '%s' (%s).",
-                template.name,
-                template.subdir,
-            )
+        with span("find_templates"):
+            self._load_templates()
 
         return True
 
@@ -169,14 +302,11 @@ class TemplateEnvironment(BaseEnvironment):
         # attribute set here to detect this).
         assert not hasattr(self, "jinja")
 
-        # Templates that are newly updated on this iteration.
-        self.updated_templates: Set[Path] = set()
-        self.updated_template_names: Set[str] = set()
+        # Template-file digests (computed on demand).
+        self.template_digests: Dict[str, str] = {}
 
         # Add additional information to template data.
         self.env_data = system_data()
-        self.template_data = copy(self.state.configs)
-        assert "env" not in self.template_data
-        self.template_data["env"] = self.env_data
+        self.init_template_data()
 
-        return result and self._init_templates(self.config.templates)
+        return result and self._init_templates()
@@ -0,0 +1,189 @@
+"""
+A module for tracking which template data is read while rendering.
+"""
+
+# built-in
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# third-party
+from jinja2.runtime import Context
+
+# internal
+from rcmpy.state.merkle import KeyPath
+
+READS: ContextVar[Optional[Set[KeyPath]]] = ContextVar("READS", default=None)
+
+
+class TrackedDict(dict):  # type: ignore[type-arg]
+    """
+    A dictionary that records the key paths of its items that are read. Any
+    operation that uses the dictionary as a whole (iteration, comparison,
+    string conversion, etc.) records the dictionary's own key path.
+    """
+
+    __slots__ = ("_tracked_path", "_tracked_reads", "_tracked_children")
+
+    def __init__(
+        self, data: Dict[str, Any], path: KeyPath, reads: Set[KeyPath]
+    ) -> None:
+        """Initialize this instance."""
+
+        super().__init__(data)
+        self._tracked_path = path
+        self._tracked_reads = reads
+        self._tracked_children: Dict[str, "TrackedDict"] = {}
+
+    def _whole(self) -> None:
+        """Record that this entire dictionary was read."""
+        self._tracked_reads.add(self._tracked_path)
+
+    def __getitem__(self, key: str) -> Any:
+        """Get an item (and record the read)."""
+
+        path = self._tracked_path + (key,)
+
+        try:
+            value = super().__getitem__(key)
+        except KeyError:
+            # Missing keys are still dependencies (they may appear later).
+            self._tracked_reads.add(path)
+            raise
+
+        # Nested dictionaries record reads of their own items.
+        if isinstance(value, dict):
+            child = self._tracked_children.get(key)
+            if child is None:
+                child = TrackedDict(value, path, self._tracked_reads)
+                self._tracked_children[key] = child
+            return child
+
+        self._tracked_reads.add(path)
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get an item with a default value (and record the read)."""
+
+        if super().__contains__(key):
+            return self[key]
+
+        self._tracked_reads.add(self._tracked_path + (key,))
+        return default
+
+    def __contains__(self, key: object) -> bool:
+        """Determine if a key is present (and record the read)."""
+
+        if isinstance(key, str):
+            self._tracked_reads.add(self._tracked_path + (key,))
+        else:
+            self._whole()
+        return super().__contains__(key)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over keys."""
+        self._whole()
+        return super().__iter__()
+
+    def __len__(self) -> int:
+        """Get the number of items."""
+        self._whole()
+        return super().__len__()
+
+    def __eq__(self, other: object) -> bool:
+        """Determine if this dictionary is equal to another object."""
+        self._whole()
+        return super().__eq__(other)
+
+    def __ne__(self, other: object) -> bool:
+        """Determine if this dictionary isn't equal to another object."""
+        self._whole()
+        return super().__ne__(other)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        """Get a string representation of this dictionary."""
+        self._whole()
+        return super().__repr__()
+
+    def keys(self):
+        """Get the keys of this dictionary."""
+        self._whole()
+        return super().keys()
+
+    def values(self):
+        """Get the values of this dictionary."""
+        self._whole()
+        return super().values()
+
+    def items(self):
+        """Get the items of this dictionary."""
+        self._whole()
+        return super().items()
+
+    def copy(self) -> Dict[str, Any]:
+        """Get a (shallow, untracked) copy of this dictionary."""
+        self._whole()
+        return dict(super().items())
+
+
+class TrackingContext(Context):
+    """
+    A template context that records the key paths of template data that are
+    read (while tracking is active).
+    """
+
+    def resolve_or_missing(self, key: str) -> Any:
+        """Look up a variable by name (and record the lookup)."""
+
+        value = super().resolve_or_missing(key)
+
+        # Variables set by the template itself aren't template data.
+        reads = READS.get()
+        if reads is not None and key not in self.vars:
+            if isinstance(value, dict) and not isinstance(value, TrackedDict):
+                return TrackedDict(value, (key,), reads)
+            reads.add((key,))
+
+        return value
+
+
+@contextmanager
+def track_reads() -> Iterator[Set[KeyPath]]:
+    """
+    Record the key paths of template data read by any template rendered (in
+    the current thread) within this context.
+    """
+
+    reads: Set[KeyPath] = set()
+    token = READS.set(reads)
+    try:
+        yield reads
+    finally:
+        READS.reset(token)
+
+
+def minimize(paths: Iterable[KeyPath]) -> List[KeyPath]:
+    """
+    Get a sorted list of key paths, without any paths that are already
+    covered by a parent path.
+    """
+
+    result: List[KeyPath] = []
+    for path in sorted(paths):
+        if not result or path[: len(result[-1])] != result[-1]:
+            result.append(path)
+    return result
+
+
+def resolve(data: Dict[str, Any], path: KeyPath) -> Tuple[bool, Any]:
+    """Attempt to get the value at a key path within some data."""
+
+    value: Any = data
+    for key in path:
+        if not isinstance(value, dict) or key not in value:
+            return False, None
+        value = value[key]
+
+    return True, value
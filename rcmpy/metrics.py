@@ -0,0 +1,138 @@
+"""
+A module for collecting (and writing) machine-readable metrics about
+applying a data repository.
+"""
+
+# built-in
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+import json
+from pathlib import Path
+from time import perf_counter_ns, time
+from typing import Any, Dict, Iterator, List
+
+# internal
+from rcmpy import PKG_NAME, VERSION
+from rcmpy.paths.atomic import write_atomic
+from rcmpy.trace import take_totals
+
+# Spans recorded while the environment loads (or reloads) that are reported
+# as phases.
+LOAD_PHASES = [
+    "load_state",
+    "variables",
+    "configs",
+    "decode",
+    "manifest",
+    "init",
+]
+
+
+@dataclass
+class ApplyMetrics:
+    """Counts and durations for a single application of changes."""
+
+    # Managed files considered (and how many were skipped).
+    evaluated: int = 0
+    skipped_condition: int = 0
+    skipped_platform: int = 0
+    missing_templates: int = 0
+
+    # Files whose output didn't need to change (either because the
+    # fingerprint of their inputs didn't change or because the output
+    # already had the correct contents).
+    unchanged: int = 0
+
+    linked: int = 0
+    copied: int = 0
+
+    # Templates rendered (not files).
+    rendered: int = 0
+
+    # Bytes written to output files and rendered blobs.
+    bytes_written: int = 0
+
+    # Durations of each phase (in seconds).
+    durations: Dict[str, float] = field(default_factory=dict)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Measure the duration of a phase."""
+
+        start = perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.durations[name] = (perf_counter_ns() - start) / 1e9
+
+    def load_phases(self) -> None:
+        """
+        Record the durations of loading phases (since they were last
+        recorded, if tracing is enabled).
+        """
+        self.durations.update(take_totals(LOAD_PHASES))
+
+    def asdict(self) -> Dict[str, Any]:
+        """Get this instance as a dictionary (with some run information)."""
+
+        return {
+            "version": VERSION,
+            "timestamp": time(),
+            **asdict(self),
+        }
+
+    def prometheus(self) -> str:
+        """Get this instance in Prometheus' text-based exposition format."""
+
+        data = asdict(self)
+        durations: Dict[str, float] = data.pop("durations")
+
+        prefix = f"{PKG_NAME}_apply"
+        lines: List[str] = []
+
+        def metric(
+            name: str, doc: str, samples: Dict[str, Any], label: str = ""
+        ) -> None:
+            """Add samples for a metric."""
+
+            lines.append(f"# HELP {prefix}_{name} {doc}")
+            lines.append(f"# TYPE {prefix}_{name} gauge")
+            for key, value in samples.items():
+                labels = f'{{{label}="{key}"}}' if label else ""
+                lines.append(f"{prefix}_{name}{labels} {value}")
+
+        metric(
+            "bytes_written",
+            "Bytes written to output files and rendered blobs.",
+            {"": data.pop("bytes_written")},
+        )
+        metric(
+            "templates_rendered",
+            "Templates rendered.",
+            {"": data.pop("rendered")},
+        )
+        metric("files", "Managed files by outcome.", data, label="outcome")
+        metric(
+            "phase_seconds",
+            "Duration of each phase.",
+            durations,
+            label="phase",
+        )
+        metric(
+            "last_run_timestamp_seconds",
+            "When changes were last applied.",
+            {"": time()},
+        )
+
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: Path = None, prometheus: Path = None) -> None:
+        """
+        Write metrics as JSON and in Prometheus' text-based format (files
+        are replaced atomically, as Prometheus' textfile collector expects).
+        """
+
+        if path is not None:
+            write_atomic(path, json.dumps(self.asdict(), indent=2) + "\n")
+        if prometheus is not None:
+            write_atomic(prometheus, self.prometheus())
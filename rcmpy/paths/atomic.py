@@ -0,0 +1,112 @@
+"""
+A module for atomically creating files.
+"""
+
+# built-in
+from contextlib import contextmanager, suppress
+from enum import Enum
+import os
+from pathlib import Path
+from secrets import token_hex
+from shutil import copyfile
+import sys
+from typing import Iterator
+
+
+class Durability(Enum):
+    """
+    How much effort to make to ensure that a new file survives a crash (or
+    power loss). Files are always replaced atomically, so readers only ever
+    see a complete old or new version of a file.
+    """
+
+    # Rely on the operating system to eventually write data back.
+    NONE = "none"
+
+    # Synchronize file contents before making the file visible.
+    FILE = "file"
+
+    # Also synchronize the parent directory (so the rename itself persists).
+    DIRECTORY = "directory"
+
+
+def temp_path(path: Path) -> Path:
+    """Get a unique, temporary path that's in the same directory as a path."""
+    return path.with_name(f".{path.name}.{os.getpid()}.{token_hex(4)}.tmp")
+
+
+def sync_file(path: Path) -> None:
+    """Synchronize a file's contents to disk."""
+
+    with path.open("rb") as path_fd:
+        os.fsync(path_fd.fileno())
+
+
+def sync_directory(path: Path) -> None:
+    """Synchronize a directory's entries to disk (where supported)."""
+
+    # Directories can't be opened (and synchronized) on Windows.
+    if sys.platform == "win32":
+        return
+
+    descriptor = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+@contextmanager
+def staged(
+    path: Path, durability: Durability = Durability.NONE
+) -> Iterator[Path]:
+    """
+    Provide a temporary path to create a file at, that gets atomically moved
+    to the provided path once the context exits (without an exception).
+    """
+
+    tmp = temp_path(path)
+
+    try:
+        yield tmp
+
+        if durability is not Durability.NONE and not tmp.is_symlink():
+            sync_file(tmp)
+
+        os.replace(tmp, path)
+
+        if durability is Durability.DIRECTORY:
+            sync_directory(path.parent)
+
+    except BaseException:
+        with suppress(FileNotFoundError):
+            tmp.unlink()
+        raise
+
+
+def write_atomic(
+    path: Path, data: str, durability: Durability = Durability.NONE
+) -> None:
+    """Atomically write text data to a file."""
+
+    with staged(path, durability) as tmp:
+        with tmp.open("x") as path_fd:
+            path_fd.write(data)
+
+
+def copy_atomic(
+    source: Path, path: Path, durability: Durability = Durability.NONE
+) -> None:
+    """Atomically copy a file."""
+
+    with staged(path, durability) as tmp:
+        copyfile(source, tmp)
+
+
+def symlink_atomic(
+    source: Path, path: Path, durability: Durability = Durability.NONE
+) -> None:
+    """Atomically create (or replace) a symbolic link."""
+
+    with staged(path, durability) as tmp:
+        tmp.symlink_to(source)
@@ -0,0 +1,64 @@
+"""
+A module implementing a content-addressed store for rendered outputs.
+"""
+
+# built-in
+from pathlib import Path
+from typing import Set, Tuple
+
+# third-party
+from vcorelib.logging import LoggerType
+from vcorelib.paths import rel, str_md5_hex
+
+# internal
+from rcmpy.paths.atomic import Durability, write_atomic
+
+
+def blob_root(build: Path) -> Path:
+    """Get the directory that blobs are stored in (for a build directory)."""
+    return build.joinpath("blobs")
+
+
+def blob_path(root: Path, digest: str) -> Path:
+    """Get the path to a blob by its digest."""
+    return root.joinpath(digest[:2], digest)
+
+
+def store_blob(
+    root: Path, content: str, durability: Durability = Durability.NONE
+) -> Tuple[Path, int]:
+    """
+    Store some content as a blob (if it's not already stored) and return the
+    path to it (and the number of bytes written).
+    """
+
+    path = blob_path(root, str_md5_hex(content))
+    written = 0
+
+    if not path.is_file():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(path, content, durability)
+        written = path.stat().st_size
+
+    return path, written
+
+
+def collect_garbage(
+    root: Path, referenced: Set[str], logger: LoggerType
+) -> int:
+    """Remove blobs that aren't referenced, return the number removed."""
+
+    count = 0
+
+    if root.is_dir():
+        for subdir in root.iterdir():
+            for path in subdir.iterdir():
+                if path.name not in referenced:
+                    path.unlink()
+                    count += 1
+
+            if not any(subdir.iterdir()):
+                subdir.rmdir()
+
+    logger.info("Removed %d unreferenced blob(s) from '%s'.", count, rel(root))
+    return count
@@ -0,0 +1,88 @@
+"""
+A module for managing this package's caches (compiled templates and
+file-information caches used by watch tasks).
+"""
+
+# built-in
+import os
+from pathlib import Path
+import re
+from shutil import rmtree
+import sys
+from typing import List
+
+# third-party
+from vcorelib.logging import LoggerType
+from vcorelib.paths import rel
+
+# internal
+from rcmpy.paths import default_cache_directory
+
+# Per-process caches (named by process identifier) were created by previous
+# versions of the watch command, and are left behind if a process crashes.
+PROCESS_CACHE = re.compile(r"^watch_cache-(\d+)\.json$")
+
+
+def bytecode_cache_root() -> Path:
+    """Get the root directory for compiled-template caches."""
+    return default_cache_directory().joinpath("bytecode")
+
+
+def purge_bytecode_cache(logger: LoggerType, root: Path = None) -> int:
+    """Remove all compiled-template caches, return the number of files."""
+
+    if root is None:
+        root = bytecode_cache_root()
+
+    count = 0
+    if root.is_dir():
+        count = sum(1 for x in root.rglob("*") if x.is_file())
+        rmtree(root)
+        logger.info("Removed %d cached template(s) in '%s'.", count, rel(root))
+
+    return count
+
+
+def pid_alive(pid: int) -> bool:
+    """Determine if a process exists."""
+
+    # Signals can't be used to probe processes on Windows.
+    if sys.platform == "win32":
+        return True
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+
+    return True
+
+
+def stale_caches(directory: Path = None) -> List[Path]:
+    """Find per-process caches that belong to processes that don't exist."""
+
+    if directory is None:
+        directory = default_cache_directory()
+
+    result = []
+
+    if directory.is_dir():
+        for path in directory.iterdir():
+            match = PROCESS_CACHE.match(path.name)
+            if match is not None and not pid_alive(int(match.group(1))):
+                result.append(path)
+
+    return result
+
+
+def clean_stale_caches(logger: LoggerType, directory: Path = None) -> int:
+    """Remove stale per-process caches, return the number removed."""
+
+    paths = stale_caches(directory=directory)
+    for path in paths:
+        path.unlink()
+        logger.info("Removed stale cache '%s'.", rel(path))
+
+    return len(paths)
@@ -3,10 +3,12 @@ A module for working with schemas belonging to this package.
 """
 
 # built-in
+from functools import lru_cache
 from typing import Optional as _Optional
 
 # third-party
 from vcorelib.dict.codec import DictCodec as _DictCodec
+from vcorelib.io.types import JsonObject as _JsonObject
 from vcorelib.schemas.base import SchemaMap as _SchemaMap
 from vcorelib.schemas.json import JsonSchemaMap as _JsonSchemaMap
 
@@ -14,11 +16,36 @@ from vcorelib.schemas.json import JsonSchemaMap as _JsonSchemaMap
 from rcmpy import PKG_NAME
 
 
+@lru_cache(maxsize=None)
+def package_schemas() -> _SchemaMap:
+    """
+    Load this package's schemas (only once, when the first instance that needs
+    them is created).
+    """
+    return _JsonSchemaMap.from_package(PKG_NAME)
+
+
 class RcmpyDictCodec(_DictCodec):
     """
     A simple wrapper for package classes that want to implement DictCodec.
     """
 
-    default_schemas: _Optional[_SchemaMap] = _JsonSchemaMap.from_package(
-        PKG_NAME
-    )
+    def __init__(
+        self,
+        data: _JsonObject = None,
+        schemas: _Optional[_SchemaMap] = None,
+        dest_attr: str = "data",
+        verify: bool = True,
+        validate: bool = True,
+    ) -> None:
+        """
+        Initialize this instance (data that was already validated, e.g. data
+        loaded from a cache, doesn't need to be validated again).
+        """
+
+        if schemas is None and validate:
+            schemas = package_schemas()
+
+        super().__init__(
+            data, schemas=schemas, dest_attr=dest_attr, verify=verify
+        )
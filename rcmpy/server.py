@@ -0,0 +1,185 @@
+"""
+A server for running commands in a warm process (one that has already
+imported this package's dependencies).
+"""
+
+# built-in
+from argparse import ArgumentParser
+from contextlib import ExitStack, redirect_stderr, redirect_stdout
+from importlib import import_module
+from io import StringIO
+import json
+import logging
+import os
+from pathlib import Path
+import socket
+from socketserver import StreamRequestHandler, UnixStreamServer
+import time
+import traceback
+from typing import Any, Dict
+
+# third-party
+from vcorelib.logging import LoggerType, init_logging
+from vcorelib.paths import rel
+
+# internal
+from rcmpy import PKG_NAME, VERSION
+from rcmpy.client import NO_SERVER_ENV, decode_args, socket_path
+
+
+def server_running(path: Path) -> bool:
+    """Determine if a server is accepting connections at a path."""
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(path))
+        except OSError:
+            return False
+
+    return True
+
+
+def process_context(stack: ExitStack, request: Dict[str, Any]) -> None:
+    """
+    Make this process' environment (working directory, environment variables
+    and logging configuration) match a client's, until the stack closes.
+    """
+
+    cwd = os.getcwd()
+    stack.callback(os.chdir, cwd)
+    os.chdir(request["cwd"])
+
+    environ = dict(os.environ)
+
+    def restore_environ() -> None:
+        """Restore the original environment variables."""
+        os.environ.clear()
+        os.environ.update(environ)
+
+    stack.callback(restore_environ)
+    os.environ.clear()
+    os.environ.update(request["env"])
+
+    # Don't let the command forward itself back to this server.
+    os.environ[NO_SERVER_ENV] = "1"
+
+    # Logging is configured again for the command (to the redirected
+    # streams).
+    root = logging.getLogger()
+    handlers = list(root.handlers)
+    level = root.level
+
+    def restore_logging() -> None:
+        """Restore the original logging configuration."""
+        root.handlers[:] = handlers
+        root.setLevel(level)
+
+    stack.callback(restore_logging)
+    root.handlers.clear()
+
+
+def run_request(request: Dict[str, Any]) -> Dict[str, Any]:
+    """Run a command on behalf of a client."""
+
+    # Clients should run commands themselves if they're a different version.
+    if request.get("version") != VERSION:
+        return {"code": None}
+
+    args = decode_args(request["args"])
+
+    # The application depends on this module (through the 'serve' command).
+    app = import_module(f"{PKG_NAME}.app")
+    if app.COMMAND is None:
+        app.add_app_args(ArgumentParser())
+
+    stdout = StringIO()
+    stderr = StringIO()
+
+    with ExitStack() as stack:
+        process_context(stack, request)
+        stack.enter_context(redirect_stdout(stdout))
+        stack.enter_context(redirect_stderr(stderr))
+
+        try:
+            init_logging(args)
+            code = app.entry(args)
+        except SystemExit as exc:
+            code = exc.code if isinstance(exc.code, int) else 1
+        except Exception:  # pylint: disable=broad-exception-caught
+            traceback.print_exc()
+            code = 1
+
+    return {
+        "code": code,
+        "stdout": stdout.getvalue(),
+        "stderr": stderr.getvalue(),
+    }
+
+
+class RequestHandler(StreamRequestHandler):
+    """Handle a single request from a client."""
+
+    def handle(self) -> None:
+        """Handle a request."""
+
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+
+        self.wfile.write(json.dumps(run_request(request)).encode())
+
+
+class Server(UnixStreamServer):
+    """
+    A server that runs commands (one at a time) on behalf of clients
+    connected to a Unix socket.
+    """
+
+    def __init__(self, path: Path = None) -> None:
+        """Initialize this instance."""
+
+        if path is None:
+            path = socket_path()
+
+        self.path = path
+        self.last_request = time.monotonic()
+
+        # Only the current user should be able to connect.
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+
+        # Remove the socket left behind by a server that didn't exit cleanly.
+        if path.is_socket() and not server_running(path):
+            path.unlink()
+
+        old_mask = os.umask(0o177)
+        try:
+            super().__init__(str(path), RequestHandler)
+        finally:
+            os.umask(old_mask)
+
+    def finish_request(self, request: Any, client_address: Any) -> None:
+        """Finish a request (and keep track of when it happened)."""
+
+        super().finish_request(request, client_address)
+        self.last_request = time.monotonic()
+
+    def server_close(self) -> None:
+        """Stop serving and remove the socket."""
+
+        super().server_close()
+        self.path.unlink(missing_ok=True)
+
+    def serve(self, logger: LoggerType, idle: float = 0.0) -> None:
+        """
+        Serve requests until interrupted (or until no requests are received
+        for some amount of time, if set).
+        """
+
+        logger.info("Serving on '%s'.", rel(self.path))
+
+        self.timeout = min(idle, 1.0) if idle > 0.0 else None
+        while not idle or time.monotonic() - self.last_request < idle:
+            self.handle_request()
+
+        logger.info("No requests for %ss, exiting.", idle)
@@ -8,20 +8,31 @@ from contextlib import ExitStack, contextmanager
 from io import StringIO
 from logging import getLogger
 from pathlib import Path
-from typing import Any, Dict, Iterator, List, cast
+from typing import Any, Dict, Iterator, List, Optional, Set, cast
 
 # third-party
-from jinja2 import Template
 from vcorelib.dict import merge
 from vcorelib.dict.cache import FileCache
 from vcorelib.io import ARBITER
 from vcorelib.io.types import DataStream
 from vcorelib.io.types import JsonObject as _JsonObject
 from vcorelib.paths import Pathlike, normalize, rel
+from vcorelib.schemas.base import SchemaMap as _SchemaMap
 
 # internal
 from rcmpy.paths import default_config_directory, default_state_directory
 from rcmpy.schemas import RcmpyDictCodec as _RcmpyDictCodec
+from rcmpy.state.decoded import DecodeCache, decode_cache
+from rcmpy.state.merkle import (
+    KeyPath,
+    changed_paths,
+    data_digest,
+    digest_tree,
+    file_tree,
+    tree_children,
+    tree_digest,
+)
+from rcmpy.trace import span
 
 LOG = getLogger(__name__)
 
@@ -31,16 +42,29 @@ class State(_RcmpyDictCodec):
 
     directory: Path
     variant: str
-    variables_new: bool
-    configs_new: bool
-    manifest: Dict[str, Any]
-    manifest_new: bool
+    logger = LOG
+
+    def __init__(
+        self,
+        data: _JsonObject = None,
+        schemas: Optional[_SchemaMap] = None,
+        dest_attr: str = "data",
+        verify: bool = True,
+        decoded: DecodeCache = None,
+    ) -> None:
+        """Initialize this instance."""
+
+        if decoded is None:
+            decoded = DecodeCache({})
+        self.decoded = decoded
+
+        super().__init__(
+            data, schemas=schemas, dest_attr=dest_attr, verify=verify
+        )
 
     def init(self, data: _JsonObject) -> None:
         """Perform implementation-specific initialization."""
 
-        self.logger = LOG
-
         self.directory = normalize(
             cast(str, data.get("directory", default_config_directory()))
         ).resolve()
@@ -54,38 +78,40 @@ class State(_RcmpyDictCodec):
         data.setdefault("previous", {})
         self.previous: Dict[str, Any] = data["previous"]  # type: ignore
         self.previous.setdefault("variant", "default")
+        self.previous.setdefault("outputs", {})
+
+        # Key paths (of variables and configs) that changed.
+        self.changes: Dict[str, Set[KeyPath]] = {}
 
         # Variables.
         self.variables: Dict[str, Any] = {}
-        self.variables_new = False
         self.previous.setdefault("variables", {})
-        self._load_variables()
+        with span("variables"):
+            self._load_variables()
 
         # Configs.
         self.configs: Dict[str, Any] = {}
-        self.configs_new = False
         self.previous.setdefault("configs", {})
-        self._load_configs()
+        with span("configs"):
+            self._load_configs()
 
-        # Manifest configuration.
-        self.manifest: Dict[str, Any] = cast(
-            Dict[str, Any], data.get("manifest", {})
-        )
-        self.manifest_new: bool = False
-
-    def is_new(self) -> bool:
-        """Determine if state has changed."""
-        return (
-            self.variant != self.previous["variant"]
-            or self.variables_new
-            or self.configs_new
-            or self.manifest_new
-        )
+    @property
+    def outputs(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Fingerprints of the inputs that produced each output file (keyed by
+        output path).
+        """
+        return cast(Dict[str, Dict[str, Any]], self.previous["outputs"])
+
+    @property
+    def variables_new(self) -> bool:
+        """Determine if variable data changed."""
+        return bool(self.changes["variables"])
 
-    def update_manifest(self, data: Dict[str, Any]) -> None:
-        """Set new manifest data."""
-        self.manifest_new = self.manifest != data
-        self.manifest = data
+    @property
+    def configs_new(self) -> bool:
+        """Determine if configuration data changed."""
+        return bool(self.changes["configs"])
 
     def root_directories(
         self, subdir: str, common_first: bool = True
@@ -106,6 +132,100 @@ class State(_RcmpyDictCodec):
 
         return [x for x in candidates if x.is_dir()]
 
+    def _decode_directory(
+        self, kind: str, path: Path, salt: str = "", **kwargs
+    ) -> Dict[str, Any]:
+        """Decode a directory of data (or load it from the cache)."""
+
+        with span("decode", path=path):
+            result = self.decoded.load(
+                f"{kind}:{path}",
+                lambda loaded: ARBITER.decode_directory(
+                    path,
+                    logger=self.logger,
+                    require_success=True,
+                    recurse=True,
+                    includes_key="includes",
+                    expect_overwrite=True,
+                    files_loaded=loaded,
+                    **kwargs,
+                ),
+                directories=[path],
+                salt=salt,
+            )
+        assert result is not None
+        return result.data
+
+    def _update_tree(
+        self,
+        kind: str,
+        data: Dict[str, Any],
+        directories: List[Path],
+        salt: str = "",
+    ) -> None:
+        """
+        Update the digest tree for some kind of data and determine which of
+        its key paths changed.
+        """
+
+        with span("digests", kind=kind):
+            self._update_tree_digests(kind, data, directories, salt)
+
+    def _update_tree_digests(
+        self,
+        kind: str,
+        data: Dict[str, Any],
+        directories: List[Path],
+        salt: str,
+    ) -> None:
+        """See '_update_tree'."""
+
+        previous = self.decoded.trees.get(kind)
+        files = file_tree(
+            self.directory.joinpath(kind),
+            self.decoded.file_digests(f"{kind}:{x}" for x in directories),
+        )
+
+        # If none of the files data was decoded from changed, the data
+        # didn't either.
+        if (
+            previous is not None
+            and previous["salt"] == salt
+            and tree_digest(previous["files"]) == tree_digest(files)
+        ):
+            keys = previous["keys"]
+        else:
+            keys = digest_tree(data)
+
+        digests = {
+            key: tree_digest(value)
+            for key, value in tree_children(keys).items()
+        }
+        old = self.previous[kind]
+
+        # Only use the previous tree to attribute changes if it matches the
+        # previous digests (otherwise only top-level keys are attributed).
+        if previous is not None and old == {
+            key: tree_digest(value)
+            for key, value in tree_children(previous["keys"]).items()
+        }:
+            self.changes[kind] = changed_paths(previous["keys"], keys)
+        else:
+            self.changes[kind] = {
+                (key,)
+                for key in set(digests) | set(old)
+                if digests.get(key) != old.get(key)
+            }
+
+        self.decoded.trees[kind] = {"salt": salt, "files": files, "keys": keys}
+        self.previous[kind] = digests
+
+    def _log_changes(self, kind: str) -> None:
+        """Log the key paths of some kind of data that changed."""
+
+        for path in sorted(self.changes[kind]):
+            self.logger.debug("Changed (%s): '%s'.", kind, ".".join(path))
+
     def _load_configs(self) -> None:
         """Load data for configs."""
 
@@ -114,55 +234,71 @@ class State(_RcmpyDictCodec):
             def preprocessor(stream: DataStream) -> DataStream:
                 """Render the variable file as a template."""
 
+                # Only import the template engine when there are configs to
+                # render.
+                # pylint: disable=import-outside-toplevel
+                from jinja2 import Template
+
                 return stack.enter_context(
                     StringIO(Template(stream.read()).render(self.variables))
                 )
 
-            for path in self.root_directories("configs"):
+            # Configs are rendered with variables, so they also need to be
+            # decoded again when variables change.
+            salt = data_digest(self.previous["variables"])
+
+            directories = self.root_directories("configs")
+            for path in directories:
                 merge(
                     self.configs,
-                    ARBITER.decode_directory(
+                    self._decode_directory(
+                        "configs",
                         path,
-                        logger=self.logger,
-                        require_success=True,
-                        recurse=True,
-                        includes_key="includes",
-                        expect_overwrite=True,
+                        salt=salt,
                         preprocessor=preprocessor,
-                    ).data,
+                    ),
                     expect_overwrite=True,
                     logger=self.logger,
                 )
 
-        self.configs_new = self.configs != self.previous["configs"]
-        self.previous["configs"] = self.configs
-
+        self._update_tree("configs", self.configs, directories, salt=salt)
         if self.configs_new:
             self.logger.info("Configuration data is updated.")
+            self._log_changes("configs")
 
     def _load_variables(self) -> None:
         """Load data for variables."""
 
-        for path in self.root_directories("variables"):
+        directories = self.root_directories("variables")
+        for path in directories:
             merge(
                 self.variables,
-                ARBITER.decode_directory(
-                    path,
-                    logger=self.logger,
-                    require_success=True,
-                    recurse=True,
-                    includes_key="includes",
-                    expect_overwrite=True,
-                ).data,
+                self._decode_directory("variables", path),
                 expect_overwrite=True,
                 logger=self.logger,
             )
 
-        self.variables_new = self.variables != self.previous["variables"]
-        self.previous["variables"] = self.variables
-
+        self._update_tree("variables", self.variables, directories)
         if self.variables_new:
             self.logger.info("Variable data is updated.")
+            self._log_changes("variables")
+
+    def reload(self, variables: bool = True) -> None:
+        """
+        Load configs (and optionally variables) again, configs depend on
+        variables so they're always re-loaded.
+        """
+
+        self.decoded.index.invalidate()
+
+        if variables:
+            self.variables = {}
+            with span("variables"):
+                self._load_variables()
+
+        self.configs = {}
+        with span("configs"):
+            self._load_configs()
 
     def set_directory(self, path: Pathlike) -> None:
         """Set a new directory to use as the data repository."""
@@ -195,7 +331,6 @@ class State(_RcmpyDictCodec):
             "directory": str(self.directory),
             "variant": self.variant,
             "previous": self.previous,
-            "manifest": self.manifest,
         }
 
 
@@ -209,10 +344,20 @@ def load_state(
         root = default_state_directory()
 
     with ExitStack() as stack:
-        data = stack.enter_context(FileCache(normalize(root, name)).loaded())
+        with span("load_state"):
+            data = stack.enter_context(
+                FileCache(normalize(root, name)).loaded()
+            )
+
+            decoded = stack.enter_context(decode_cache())
+            state = State(data, verify=False, decoded=decoded)
 
-        state = State.create(data, verify=False)
         yield state
 
+        decoded.log_stats(state.logger)
+
         # Update the original dictionary with any changes to the state object.
         data.update(state.asdict())
+
+        with span("save_state"):
+            stack.close()
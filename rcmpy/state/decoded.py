@@ -0,0 +1,147 @@
+"""
+A module implementing a cache for data decoded from a data repository.
+"""
+
+# built-in
+from contextlib import contextmanager
+from copy import deepcopy
+from logging import getLogger
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+# third-party
+from vcorelib.dict.cache import FileCache
+from vcorelib.io.types import LoadResult
+from vcorelib.logging import LoggerType
+from vcorelib.paths import Pathlike, normalize
+
+# internal
+from rcmpy.paths import default_cache_directory
+from rcmpy.state.index import ChangeIndex
+
+LOG = getLogger(__name__)
+
+# A function that decodes data, adding paths to a list of files that were
+# loaded (so that data decoded from included files is invalidated properly).
+Decoder = Callable[[List[Path]], Optional[LoadResult]]
+
+
+class DecodeCache:
+    """
+    Data decoded from files, keyed by what was decoded and invalidated when
+    any of the files involved (or a value data depends on) changes.
+    """
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        """Initialize this instance."""
+
+        self.entries: Dict[str, Dict[str, Any]] = data.setdefault(
+            "entries", {}
+        )
+
+        # Digest trees of decoded data (and the files it was decoded from).
+        self.trees: Dict[str, Dict[str, Any]] = data.setdefault("trees", {})
+
+        # Files that data is decoded from (and any other files in the data
+        # repository).
+        self.index = ChangeIndex(data.setdefault("index", {}))
+        self.hits = 0
+        self.misses = 0
+
+    def _current(
+        self, entry: Dict[str, Any], paths: Iterable[Path], salt: str
+    ) -> bool:
+        """Determine if a cache entry is still current."""
+
+        inputs: Dict[str, Optional[str]] = entry["inputs"]
+
+        # Any new file invalidates the entry.
+        if entry["salt"] != salt or not {str(x) for x in paths}.issubset(
+            inputs
+        ):
+            return False
+
+        return all(
+            self.index.digest(Path(path)) == digest
+            for path, digest in inputs.items()
+        )
+
+    def load(
+        self,
+        key: str,
+        decode: Decoder,
+        directories: Iterable[Path] = (),
+        candidates: Iterable[Path] = (),
+        salt: str = "",
+    ) -> Optional[LoadResult]:
+        """
+        Load data from the cache if none of the files in the provided
+        directories, the candidate files (that may not exist) or the files
+        loaded the last time data was decoded have changed. Otherwise,
+        decode the data and store it in the cache.
+        """
+
+        paths = list(candidates)
+        for directory in directories:
+            paths.extend(self.index.files_in(directory))
+
+        entry = self.entries.get(key)
+        if entry is not None and self._current(entry, paths, salt):
+            self.hits += 1
+            LOG.debug("Using cached data for '%s'.", key)
+            return LoadResult(deepcopy(entry["data"]), True)
+
+        self.misses += 1
+
+        loaded: List[Path] = []
+        result = decode(loaded)
+
+        self.entries.pop(key, None)
+        if result is not None and result.success:
+            self.entries[key] = {
+                "salt": salt,
+                "inputs": {
+                    str(x): self.index.digest(x)
+                    for x in paths + [x for x in loaded if isinstance(x, Path)]
+                },
+                "data": deepcopy(result.data),
+            }
+
+        return result
+
+    def file_digests(self, keys: Iterable[str]) -> Dict[str, str]:
+        """Get digests of the files that cache entries were decoded from."""
+
+        result: Dict[str, str] = {}
+        for key in keys:
+            entry = self.entries.get(key)
+            if entry is not None:
+                result.update(
+                    (path, digest)
+                    for path, digest in entry["inputs"].items()
+                    if digest is not None
+                )
+        return result
+
+    def log_stats(self, logger: LoggerType) -> None:
+        """Log cache-usage statistics."""
+
+        logger.info(
+            "Decoded-data cache: %d hit(s), %d miss(es).",
+            self.hits,
+            self.misses,
+        )
+        self.index.log_stats(logger)
+
+
+@contextmanager
+def decode_cache(
+    root: Pathlike = None, name: str = "decoded.json"
+) -> Iterator[DecodeCache]:
+    """Load a decoded-data cache (and write it back to disk when finished)."""
+
+    if root is None:
+        root = default_cache_directory()
+
+    with FileCache(normalize(root, name)).loaded() as data:
+        yield DecodeCache(data)
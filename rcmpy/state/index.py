@@ -0,0 +1,221 @@
+"""
+A module implementing a persistent index of files in a data repository.
+"""
+
+# built-in
+import os
+from pathlib import Path
+from stat import S_ISDIR
+from time import time_ns
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# third-party
+from vcorelib.logging import LoggerType
+from vcorelib.paths import file_md5_hex
+
+# Modification times this close to when a file (or directory) was indexed
+# aren't trusted, a change within the file system's timestamp granularity
+# could go unnoticed otherwise.
+RACY_NS = 2 * 10**9
+
+
+class ChangeIndex:
+    """
+    An index of files (size, modification time, inode and content digest)
+    that's updated incrementally. File contents are only hashed when their
+    size, modification time or inode change, and directories are only listed
+    again when their modification time changes.
+
+    Each path is only checked once, queries reflect the state of the file
+    system when a path was first queried (until the index is invalidated).
+    """
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        """Initialize this instance."""
+
+        # Path -> [size, mtime_ns, inode, digest].
+        self.files: Dict[str, List[Any]] = data.setdefault("files", {})
+
+        # Path -> [mtime_ns, file names, directory names].
+        self.directories: Dict[str, List[Any]] = data.setdefault(
+            "directories", {}
+        )
+
+        # Paths that were added, modified or removed since they were last
+        # indexed.
+        self.changed: Set[Path] = set()
+
+        self.listed = 0
+        self.hashed = 0
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """Check paths against the file system again when next queried."""
+
+        self.started = time_ns()
+        self.checked: Set[str] = set()
+
+    def racy(self, mtime_ns: int) -> int:
+        """
+        Get a modification time to store (one that will never match if it's
+        too recent to be trusted).
+        """
+        return -1 if mtime_ns >= self.started - RACY_NS else mtime_ns
+
+    def _remove(self, path: Path) -> None:
+        """Remove a file (or a directory and its contents) from the index."""
+
+        key = str(path)
+        if self.files.pop(key, None) is not None:
+            self.changed.add(path)
+
+        entry = self.directories.pop(key, None)
+        if entry is not None:
+            for name in entry[1]:
+                self._remove(path.joinpath(name))
+            for name in entry[2]:
+                self._remove(path.joinpath(name))
+
+    def _update_file(self, path: Path) -> Optional[str]:
+        """Update a file's entry and return its digest."""
+
+        key = str(path)
+        self.checked.add(key)
+
+        try:
+            stat = path.stat()
+        except OSError:
+            stat = None
+
+        if stat is None or S_ISDIR(stat.st_mode):
+            self._remove(path)
+            return None
+
+        # Handle directories replaced by files.
+        if key in self.directories:
+            self._remove(path)
+
+        previous = self.files.get(key)
+        signature = [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+        if previous is not None and previous[:3] == signature:
+            return str(previous[3])
+
+        digest = file_md5_hex(path)
+        self.hashed += 1
+        if previous is None or previous[3] != digest:
+            self.changed.add(path)
+
+        signature[1] = self.racy(stat.st_mtime_ns)
+        self.files[key] = signature + [digest]
+        return digest
+
+    def _list(
+        self, path: Path, previous: Optional[List[Any]]
+    ) -> Tuple[List[str], List[str]]:
+        """
+        List the files and directories in a directory (and remove entries for
+        anything that no longer exists).
+        """
+
+        files, directories = [], []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    directories.append(entry.name)
+                elif entry.is_file():
+                    files.append(entry.name)
+        self.listed += 1
+
+        if previous is not None:
+            for name in set(previous[1] + previous[2]) - set(
+                files + directories
+            ):
+                self._remove(path.joinpath(name))
+
+        return sorted(files), sorted(directories)
+
+    def _update_directory(self, path: Path, visited: Set[Any]) -> None:
+        """Update the entries for a directory (recursively)."""
+
+        key = str(path)
+        self.checked.add(key)
+
+        try:
+            stat = path.stat()
+        except OSError:
+            stat = None
+
+        if stat is None or not S_ISDIR(stat.st_mode):
+            self._remove(path)
+            return
+
+        # Handle files replaced by directories.
+        if self.files.pop(key, None) is not None:
+            self.changed.add(path)
+
+        # Don't follow symbolic-link cycles.
+        identity = (stat.st_dev, stat.st_ino)
+        if identity in visited:
+            return
+        visited.add(identity)
+
+        previous = self.directories.get(key)
+        if previous is not None and previous[0] == stat.st_mtime_ns:
+            files, directories = previous[1], previous[2]
+        else:
+            files, directories = self._list(path, previous)
+            self.directories[key] = [
+                self.racy(stat.st_mtime_ns),
+                files,
+                directories,
+            ]
+
+        for name in files:
+            self._update_file(path.joinpath(name))
+        for name in directories:
+            self._update_directory(path.joinpath(name), visited)
+
+    def digest(self, path: Path) -> Optional[str]:
+        """Get the digest of a file (None if it doesn't exist)."""
+
+        key = str(path)
+        if key not in self.checked:
+            return self._update_file(path)
+
+        entry = self.files.get(key)
+        return None if entry is None else str(entry[3])
+
+    def _collect(self, path: Path, result: List[Path]) -> None:
+        """Collect the indexed files in a directory (recursively)."""
+
+        entry = self.directories.get(str(path))
+        if entry is not None:
+            result.extend(
+                x
+                for x in (path.joinpath(x) for x in entry[1])
+                if str(x) in self.files
+            )
+            for name in entry[2]:
+                self._collect(path.joinpath(name), result)
+
+    def files_in(self, directory: Path) -> List[Path]:
+        """Get all of the files in a directory (recursively)."""
+
+        if str(directory) not in self.checked:
+            self._update_directory(directory, set())
+
+        result: List[Path] = []
+        self._collect(directory, result)
+        return result
+
+    def log_stats(self, logger: LoggerType) -> None:
+        """Log index statistics."""
+
+        logger.info(
+            "Change index: %d file(s), %d director(ies) listed, "
+            "%d file(s) hashed, %d change(s).",
+            len(self.files),
+            self.listed,
+            self.hashed,
+            len(self.changed),
+        )
@@ -0,0 +1,100 @@
+"""
+A module implementing digest (Merkle) trees over nested data, so that
+changes can be attributed to specific key paths.
+"""
+
+# built-in
+from json import dumps
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+# third-party
+from vcorelib.paths import str_md5_hex
+
+# A path of keys into (nested) data.
+KeyPath = Tuple[str, ...]
+
+# A leaf's digest, or a dictionary's digest and the trees of its items.
+Tree = Union[str, List[Any]]
+
+
+def data_digest(data: Any) -> str:
+    """Get a digest for some decoded data."""
+    return str_md5_hex(dumps(data, sort_keys=True, default=str))
+
+
+def digest_tree(data: Any) -> Tree:
+    """
+    Build a digest tree for some data (a dictionary's digest only depends on
+    the digests of its items).
+    """
+
+    if not isinstance(data, dict):
+        return data_digest(data)
+
+    children = {str(key): digest_tree(value) for key, value in data.items()}
+    return [
+        data_digest({key: tree_digest(x) for key, x in children.items()}),
+        children,
+    ]
+
+
+def tree_digest(tree: Tree) -> str:
+    """Get the digest of a tree's root."""
+    return tree if isinstance(tree, str) else str(tree[0])
+
+
+def tree_children(tree: Tree) -> Dict[str, Tree]:
+    """Get the trees of a dictionary's items (none for leaves)."""
+    return {} if isinstance(tree, str) else dict(tree[1])
+
+
+def changed_paths(
+    old: Optional[Tree], new: Optional[Tree], prefix: KeyPath = ()
+) -> Set[KeyPath]:
+    """
+    Determine the key paths that differ between two trees (only descending
+    into dictionaries whose digests differ).
+    """
+
+    if old is not None and new is not None:
+        if tree_digest(old) == tree_digest(new):
+            return set()
+
+        # Descend if both sides are dictionaries.
+        if not isinstance(old, str) and not isinstance(new, str):
+            old_children = tree_children(old)
+            new_children = tree_children(new)
+
+            result: Set[KeyPath] = set()
+            for key in set(old_children) | set(new_children):
+                result |= changed_paths(
+                    old_children.get(key),
+                    new_children.get(key),
+                    prefix + (key,),
+                )
+            return result
+
+    return set() if old is None and new is None else {prefix}
+
+
+def file_tree(root: Path, files: Dict[str, str]) -> Tree:
+    """
+    Build a digest tree from file digests (keyed by path), nested by the
+    parts of each path relative to a root directory.
+    """
+
+    nested: Dict[str, Any] = {}
+    for path, digest in files.items():
+        try:
+            parts: Iterable[str] = Path(path).relative_to(root).parts
+        except ValueError:
+            parts = [path]
+
+        *parents, name = parts
+        node = nested
+        for part in parents:
+            node = node.setdefault(part, {})
+        node[name] = digest
+
+    return digest_tree(nested)
@@ -0,0 +1,133 @@
+"""
+A module for (optionally) tracing how long phases of a command take, as
+Chrome trace-event data (viewable with 'chrome://tracing' or Perfetto).
+"""
+
+# built-in
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+import json
+import os
+from pathlib import Path
+from threading import Lock, get_native_id
+from time import perf_counter_ns
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+# internal
+from rcmpy import PKG_NAME
+
+
+class Tracer:
+    """
+    A collection of trace events (and the total duration of spans by name).
+    """
+
+    def __init__(self, events: bool = True) -> None:
+        """Initialize this instance."""
+
+        self.events: List[Dict[str, Any]] = []
+        self.keep_events = events
+        self.totals: Dict[str, float] = {}
+        self.lock = Lock()
+        self.start = perf_counter_ns()
+
+    def timestamp(self) -> float:
+        """Get the current trace timestamp (in microseconds)."""
+        return (perf_counter_ns() - self.start) / 1000.0
+
+    @contextmanager
+    def span(self, name: str, args: Dict[str, Any]) -> Iterator[None]:
+        """Record how long a managed context takes."""
+
+        start = self.timestamp()
+        try:
+            yield
+        finally:
+            duration = self.timestamp() - start
+            event = {
+                "name": name,
+                "ph": "X",
+                "ts": start,
+                "dur": duration,
+                "pid": os.getpid(),
+                "tid": get_native_id(),
+            }
+            if args:
+                event["args"] = {key: str(val) for key, val in args.items()}
+
+            with self.lock:
+                if self.keep_events:
+                    self.events.append(event)
+                self.totals[name] = self.totals.get(name, 0.0) + (
+                    duration / 1e6
+                )
+
+    def asdict(self) -> Dict[str, Any]:
+        """Get trace-event data for this instance's events."""
+
+        return {
+            "traceEvents": [
+                {
+                    "name": "process_name",
+                    "ph": "M",
+                    "pid": os.getpid(),
+                    "args": {"name": PKG_NAME},
+                },
+                *sorted(self.events, key=lambda x: float(x["ts"])),
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+
+TRACER: Optional[Tracer] = None
+NULL_SPAN = nullcontext()
+
+
+def span(name: str, **args: Any) -> AbstractContextManager[None]:
+    """
+    Create a span for a phase of a command (that does nothing if tracing
+    isn't enabled).
+    """
+
+    if TRACER is None:
+        return NULL_SPAN
+    return TRACER.span(name, args)
+
+
+def take_totals(names: Iterable[str]) -> Dict[str, float]:
+    """
+    Get the total duration (in seconds) of spans with some names, since
+    their totals were last taken.
+    """
+
+    result: Dict[str, float] = {}
+
+    if TRACER is not None:
+        with TRACER.lock:
+            for name in names:
+                if name in TRACER.totals:
+                    result[name] = TRACER.totals.pop(name)
+
+    return result
+
+
+@contextmanager
+def traced(path: Optional[Path], totals: bool = False) -> Iterator[None]:
+    """
+    Trace a managed context (if a path is set, or if span totals are needed)
+    and write the results (if a path is set).
+    """
+
+    global TRACER  # pylint: disable=global-statement
+
+    if path is None and not totals:
+        yield
+        return
+
+    tracer = Tracer(events=path is not None)
+    TRACER = tracer
+    try:
+        yield
+    finally:
+        TRACER = None
+        if path is not None:
+            path.write_text(json.dumps(tracer.asdict()), encoding="utf-8")
@@ -0,0 +1,73 @@
+"""
+A module implementing a configuration interface for watching many directories.
+"""
+
+# built-in
+from os.path import expandvars
+from pathlib import Path
+from typing import Any, Dict, List, cast
+
+# third-party
+from vcorelib.dict.codec import BasicDictCodec as _BasicDictCodec
+from vcorelib.io import ARBITER
+from vcorelib.paths import Pathlike, normalize
+
+# internal
+from rcmpy.schemas import RcmpyDictCodec as _RcmpyDictCodec
+from rcmpy.watch.params import WatchParams
+
+
+class WatchConfig(_RcmpyDictCodec, _BasicDictCodec):
+    """A set of rules for running commands when directories change."""
+
+    def params(
+        self, root: Path, base: Path, single_pass: bool = False
+    ) -> List[WatchParams]:
+        """
+        Create watch parameters for each rule (relative directories are
+        relative to the provided root).
+        """
+
+        data = cast(Dict[str, Any], self.data)
+
+        return [
+            WatchParams(
+                base,
+                root.joinpath(
+                    Path(expandvars(rule["directory"])).expanduser()
+                ),
+                rule["command"],
+                data["check_contents"],
+                rule["shell"],
+                single_pass,
+                data["poll_rate"],
+                data["backend"],
+                rule["settle"],
+                rule["restart"],
+                rule["grace"],
+                tuple(rule.get("include", [])),
+                tuple(rule.get("exclude", [])),
+                rule["gitignore"],
+                rule["jobs"],
+                root.joinpath(data["cache"]) if "cache" in data else None,
+            )
+            for rule in data["rules"]
+        ]
+
+    @property
+    def jobs(self) -> int:
+        """
+        The maximum number of commands to run at once (across all rules), zero
+        means no limit.
+        """
+        return cast(int, self.data["jobs"])
+
+    @staticmethod
+    def load(path: Pathlike) -> "WatchConfig":
+        """Load a watch configuration from a file."""
+
+        return WatchConfig(
+            data=ARBITER.decode(
+                normalize(path), includes_key="includes", require_success=True
+            ).data
+        )
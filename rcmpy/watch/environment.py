@@ -0,0 +1,91 @@
+"""
+An interface for keeping an environment up-to-date with its data repository.
+"""
+
+# built-in
+from asyncio import Event, get_running_loop
+from contextlib import ExitStack
+from logging import getLogger
+from pathlib import Path
+from typing import Callable, Set
+
+# internal
+from rcmpy.environment import SOURCE_DIRECTORIES, Environment, source_kind
+from rcmpy.watch.filters import PathFilter
+from rcmpy.watch.params import WatchParams
+from rcmpy.watch.task import create_source
+
+LOG = getLogger(__name__)
+
+
+class RepositoryFilter(PathFilter):
+    """
+    A path filter that only watches the parts of a data repository that
+    environments are loaded from (not outputs, or the build directory).
+    """
+
+    def allowed(self, path: Path, is_dir: bool) -> bool:
+        """Determine if a file (or directory) should be watched."""
+
+        if is_dir:
+            return path.parent != self.root or path.name in SOURCE_DIRECTORIES
+
+        return bool(source_kind(self.root, path))
+
+
+async def watch_environment(
+    stop_sig: Event,
+    env: Environment,
+    apply: Callable[[], int],
+    params: WatchParams = None,
+) -> int:
+    """
+    Watch an environment's data repository, refresh the environment and
+    apply it whenever its sources change.
+    """
+
+    if params is None:
+        params = WatchParams(
+            env.state.directory, env.state.directory, [], True
+        )
+
+    loop = get_running_loop()
+
+    with ExitStack() as stack:
+        source = create_source(
+            params, stack, path_filter=RepositoryFilter(params.directory)
+        )
+
+        # Files only count as changed once they differ from the initial scan.
+        source.poll()
+        LOG.info("Watching '%s' for changes.", params.directory)
+
+        pending: Set[Path] = set()
+        last_change = 0.0
+
+        while not stop_sig.is_set():
+            changed = source.poll()
+            if changed:
+                pending |= changed
+                last_change = loop.time()
+
+            remaining = params.settle - (loop.time() - last_change)
+            if pending and remaining <= 0.0:
+                try:
+                    if env.refresh(pending):
+                        apply()
+
+                # Keep watching if the repository is in a bad state (e.g.
+                # while a file is being edited).
+                except Exception:  # pylint: disable=broad-exception-caught
+                    LOG.exception("Couldn't apply changes:")
+
+                pending = set()
+
+            await source.wait(
+                min(params.poll_rate, remaining)
+                if pending
+                else params.poll_rate
+            )
+
+    return 0
@@ -0,0 +1,228 @@
+"""
+An interface for selecting which files to watch.
+"""
+
+# built-in
+from fnmatch import fnmatchcase
+import os
+from pathlib import Path
+from typing import Iterable, Iterator, List, NamedTuple, Tuple
+
+# internal
+from rcmpy.watch.params import WatchParams
+
+
+class Pattern(NamedTuple):
+    """A glob pattern (with '.gitignore' semantics)."""
+
+    glob: str
+    negated: bool = False
+    directory_only: bool = False
+    anchored: bool = False
+
+    @staticmethod
+    def create(line: str) -> "Pattern":
+        """Create a pattern from a glob (or '.gitignore' line)."""
+
+        negated = line.startswith("!")
+        if negated:
+            line = line[1:]
+
+        directory_only = line.endswith("/")
+        line = line.rstrip("/")
+
+        # Patterns containing a separator are relative to the root.
+        anchored = "/" in line
+        line = line.lstrip("/")
+
+        return Pattern(line, negated, directory_only, anchored)
+
+    def matches(self, relative: str, is_dir: bool) -> bool:
+        """Determine if a root-relative (POSIX) path matches this pattern."""
+
+        if self.directory_only and not is_dir:
+            return False
+
+        return fnmatchcase(
+            relative if self.anchored else relative.rsplit("/", 1)[-1],
+            self.glob,
+        )
+
+
+def read_gitignore(path: Path) -> List[Pattern]:
+    """Read patterns from a '.gitignore' file (if it exists)."""
+
+    patterns = []
+
+    if path.is_file():
+        with path.open(encoding="utf-8") as path_fd:
+            for line in path_fd:
+                line = line.rstrip("\n").rstrip()
+                if line and not line.startswith("#"):
+                    patterns.append(Pattern.create(line))
+
+    return patterns
+
+
+def excluded(patterns: Iterable[Pattern], relative: str, is_dir: bool) -> bool:
+    """Determine if a path is excluded (the last matching pattern wins)."""
+
+    result = False
+    for pattern in patterns:
+        if pattern.matches(relative, is_dir):
+            result = not pattern.negated
+    return result
+
+
+class PathFilter:
+    """
+    A class for determining which files (and directories) to watch. Excluded
+    directories are never traversed.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        include: Iterable[str] = (),
+        exclude: Iterable[str] = (),
+        gitignore: bool = False,
+    ) -> None:
+        """Initialize this instance."""
+
+        # Changed files are reported as resolved paths.
+        self.root = root.resolve()
+        self.include = [Pattern.create(x) for x in include]
+        self.exclude = [Pattern.create(x) for x in exclude]
+
+        if gitignore:
+            # Git never tracks its own directory.
+            self.exclude.append(Pattern.create(".git/"))
+            self.exclude.extend(
+                read_gitignore(self.root.joinpath(".gitignore"))
+            )
+
+    @staticmethod
+    def from_params(params: WatchParams) -> "PathFilter":
+        """Create a path filter from watch parameters."""
+
+        return PathFilter(
+            params.directory, params.include, params.exclude, params.gitignore
+        )
+
+    @property
+    def roots(self) -> List[Path]:
+        """The directories to traverse."""
+        return [self.root]
+
+    def relative(self, path: Path) -> str:
+        """Get a root-relative, POSIX path string."""
+        return Path(os.path.relpath(path, self.root)).as_posix()
+
+    def allowed(self, path: Path, is_dir: bool) -> bool:
+        """Determine if a file (or directory) should be watched."""
+
+        relative = self.relative(path)
+
+        if excluded(self.exclude, relative, is_dir):
+            return False
+
+        # Directories aren't subject to include patterns (their contents may
+        # be).
+        return (
+            is_dir
+            or not self.include
+            or any(x.matches(relative, is_dir) for x in self.include)
+        )
+
+    def selects(self, path: Path) -> bool:
+        """Determine if a file is (or would be) watched by this filter."""
+
+        if not path.is_relative_to(self.root):
+            return False
+
+        # Files in excluded directories aren't watched.
+        return all(
+            self.allowed(parent, True)
+            for parent in path.parents
+            if parent != self.root and parent.is_relative_to(self.root)
+        ) and self.allowed(path, False)
+
+    def scan(self, directory: Path) -> Tuple[List[Path], List[Path]]:
+        """Get the allowed files and sub-directories in a directory."""
+
+        files: List[Path] = []
+        directories: List[Path] = []
+
+        try:
+            entries = list(os.scandir(directory))
+        except (FileNotFoundError, NotADirectoryError):
+            entries = []
+
+        for entry in entries:
+            path = Path(entry.path)
+            is_dir = entry.is_dir()
+            if is_dir or entry.is_file():
+                if self.allowed(path, is_dir):
+                    (directories if is_dir else files).append(path)
+
+        return files, directories
+
+    def directories(self, root: Path) -> Iterator[Path]:
+        """Iterate over a directory and all allowed sub-directories."""
+
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            yield directory
+            stack.extend(self.scan(directory)[1])
+
+    def files(self, root: Path) -> Iterator[Path]:
+        """Iterate over all allowed files in a directory tree."""
+
+        stack = [root]
+        while stack:
+            files, directories = self.scan(stack.pop())
+            yield from files
+            stack.extend(directories)
+
+
+class PathFilters(PathFilter):
+    """
+    A class for watching files selected by any of a number of filters (which
+    may have different roots).
+    """
+
+    def __init__(self, filters: Iterable[PathFilter]) -> None:
+        """Initialize this instance."""
+
+        self.filters = list(filters)
+
+        # Don't traverse any root more than once.
+        self._roots: List[Path] = []
+        for root in sorted(set(x.root for x in self.filters)):
+            if not any(root.is_relative_to(x) for x in self._roots):
+                self._roots.append(root)
+
+        super().__init__(self._roots[0])
+
+    @property
+    def roots(self) -> List[Path]:
+        """The directories to traverse."""
+        return self._roots
+
+    def allowed(self, path: Path, is_dir: bool) -> bool:
+        """Determine if a file (or directory) should be watched."""
+
+        for path_filter in self.filters:
+            if path == path_filter.root or (
+                path.is_relative_to(path_filter.root)
+                and path_filter.allowed(path, is_dir)
+            ):
+                return True
+
+            # Directories that contain another filter's root need to be
+            # traversed.
+            if is_dir and path_filter.root.is_relative_to(path):
+                return True
+
+        return False
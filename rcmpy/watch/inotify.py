@@ -0,0 +1,267 @@
+"""
+A file-system event source backed by Linux' inotify (via ctypes).
+"""
+
+# built-in
+from asyncio import Event
+from asyncio import TimeoutError as _TimeoutError
+from asyncio import get_running_loop, wait_for
+from contextlib import ExitStack, suppress
+import ctypes
+from ctypes.util import find_library
+import errno
+from logging import getLogger
+import os
+from pathlib import Path
+from struct import Struct
+import sys
+from typing import Dict, Optional, Set
+
+# internal
+from rcmpy.watch.filters import PathFilter
+from rcmpy.watch.params import WatchParams
+from rcmpy.watch.source import EventSource
+
+# Flags and event masks (from 'sys/inotify.h').
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+IN_ATTRIB = 0x4
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+IN_Q_OVERFLOW = 0x4000
+IN_IGNORED = 0x8000
+IN_ISDIR = 0x40000000
+
+# Files are checked once they're closed (after writing) rather than on every
+# modification, so partially written files are less likely to be seen.
+WATCH_MASK = (
+    IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+)
+
+# struct inotify_event { int wd; uint32_t mask, cookie, len; char name[]; }
+EVENT = Struct("iIII")
+
+READ_SIZE = 64 * 1024
+
+# Directories can be removed (or replaced) before they're watched.
+MISSING = {errno.ENOENT, errno.ENOTDIR}
+
+LOG = getLogger(__name__)
+
+
+def load_libc() -> Optional[ctypes.CDLL]:
+    """Load the C library, if it provides inotify."""
+
+    libc = None
+
+    if sys.platform.startswith("linux"):
+        with suppress(OSError):
+            candidate = ctypes.CDLL(find_library("c"), use_errno=True)
+            if hasattr(candidate, "inotify_init1"):
+                libc = candidate
+
+    return libc
+
+
+LIBC = load_libc()
+
+
+def inotify_available() -> bool:
+    """Determine if inotify can be used on this system."""
+    return LIBC is not None
+
+
+def check_call(result: int) -> int:
+    """Raise an error if a C library call failed."""
+
+    if result < 0:
+        code = ctypes.get_errno()
+        raise OSError(code, os.strerror(code))
+    return result
+
+
+class InotifySource(EventSource):
+    """
+    An event source that only checks files that the kernel reports activity
+    for. Nothing is polled while the watched directory is idle (unless
+    directories can't be watched, e.g. because of the per-user limit on
+    watches, then every file is checked on each poll instead).
+    """
+
+    def __init__(
+        self,
+        params: WatchParams,
+        stack: ExitStack,
+        path_filter: PathFilter = None,
+    ) -> None:
+        """Initialize this instance."""
+
+        assert LIBC is not None, "inotify isn't available!"
+
+        if path_filter is None:
+            path_filter = PathFilter.from_params(params)
+        self.filter = path_filter
+
+        self.fd = check_call(LIBC.inotify_init1(IN_NONBLOCK | IN_CLOEXEC))
+        stack.callback(self.close)
+
+        self.watches: Dict[int, Path] = {}
+        self.pending: Set[Path] = set()
+        self.new_directories: Set[Path] = set()
+        self.rescan = True
+        self.check_existing = False
+        self.event = Event()
+        self.reading = False
+        self.polling = False
+
+        for root in path_filter.roots:
+            self.add_watches(root)
+
+        super().__init__(params, stack, path_filter=path_filter)
+
+    def close(self) -> None:
+        """Stop watching and release the inotify instance."""
+
+        if self.reading:
+            get_running_loop().remove_reader(self.fd)
+            self.reading = False
+
+        os.close(self.fd)
+
+    def add_watches(self, root: Path) -> None:
+        """
+        Watch a directory tree (except for excluded directories and
+        directories that are already watched).
+        """
+
+        assert LIBC is not None
+
+        watched = set(self.watches.values())
+        for directory in self.filter.directories(root):
+            if directory in watched:
+                continue
+
+            try:
+                watch = check_call(
+                    LIBC.inotify_add_watch(
+                        self.fd, os.fsencode(directory), WATCH_MASK
+                    )
+                )
+            except OSError as exc:
+                if exc.errno in MISSING:
+                    continue
+
+                if not self.polling:
+                    LOG.warning(
+                        "Can't watch '%s' (%s), checking every file instead.",
+                        directory,
+                        exc.strerror,
+                    )
+                    self.polling = True
+                return
+
+            self.watches[watch] = directory
+
+    def handle(self, watch: int, mask: int, name: str) -> None:
+        """Handle an individual inotify event."""
+
+        if mask & IN_Q_OVERFLOW:
+            self.rescan = True
+            return
+
+        parent = self.watches.get(watch)
+        if parent is None:
+            return
+
+        if mask & IN_IGNORED:
+            del self.watches[watch]
+            return
+
+        path = parent.joinpath(name) if name else parent
+
+        if mask & IN_ISDIR or not name:
+            if mask & (IN_CREATE | IN_MOVED_TO):
+                if self.filter.allowed(path, True):
+                    self.new_directories.add(path)
+            else:
+                self.check_existing = True
+        elif self.filter.allowed(path, False):
+            self.pending.add(path)
+
+    def read(self) -> None:
+        """Read all available events."""
+
+        while True:
+            try:
+                data = os.read(self.fd, READ_SIZE)
+            except BlockingIOError:
+                break
+
+            offset = 0
+            while offset < len(data):
+                watch, mask, _, length = EVENT.unpack_from(data, offset)
+                offset += EVENT.size
+                name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+                self.handle(watch, mask, os.fsdecode(name))
+
+        self.event.set()
+
+    def _poll(self) -> None:
+        """Check any files that may have changed."""
+
+        self.read()
+
+        # Events may have been lost, so watch any directories that aren't
+        # watched yet (and check every file).
+        if self.rescan:
+            for root in self.filter.roots:
+                self.add_watches(root)
+
+        if self.rescan or self.polling:
+            self.scan()
+            self.rescan = False
+            self.check_existing = False
+            self.new_directories = set()
+            self.pending = set()
+
+        base = self.params.base
+
+        # Watch (and check the contents of) new directories.
+        for directory in self.new_directories:
+            if directory.is_dir():
+                self.add_watches(directory)
+                self.scan(directory)
+        self.new_directories = set()
+
+        if self.check_existing:
+            self.files.poll_existing(base=base)
+            self.check_existing = False
+
+        for path in self.pending:
+            self.files.poll_file(path, base=base)
+        self.pending = set()
+
+        self.event.clear()
+
+    async def wait(self, timeout: float) -> None:
+        """Wait (up to some timeout) for files to possibly change."""
+
+        if not self.reading:
+            get_running_loop().add_reader(self.fd, self.read)
+            self.reading = True
+
+        with suppress(_TimeoutError):
+            await wait_for(self.event.wait(), timeout)
@@ -4,11 +4,29 @@ An interface for implementing file-system watching parameters.
 
 # built-in
 from argparse import ArgumentParser as _ArgumentParser
+from argparse import ArgumentTypeError
 from argparse import Namespace as _Namespace
 from pathlib import Path
-from typing import List, NamedTuple
+from typing import List, NamedTuple, Optional, Tuple
 
 DEFAULT_POLL_RATE = 0.1
+DEFAULT_SETTLE = 0.05
+DEFAULT_GRACE = 5.0
+BACKENDS = ["auto", "inotify", "poll"]
+
+# Arguments that still apply when rules come from a configuration file (the
+# rest are set by the configuration file instead).
+CONFIG_ARGS = {"config", "single_pass"}
+POSITIONAL_ARGS = {"directory", "cmd"}
+
+
+def positive_int(value: str) -> int:
+    """Parse a positive integer (from a command-line argument)."""
+
+    result = int(value)
+    if result < 1:
+        raise ArgumentTypeError(f"must be at least 1 (not {result})")
+    return result
 
 
 class WatchParams(NamedTuple):
@@ -21,6 +39,15 @@ class WatchParams(NamedTuple):
     shell: bool = False
     single_pass: bool = False
     poll_rate: float = DEFAULT_POLL_RATE
+    backend: str = "auto"
+    settle: float = DEFAULT_SETTLE
+    restart: bool = False
+    grace: float = DEFAULT_GRACE
+    include: Tuple[str, ...] = ()
+    exclude: Tuple[str, ...] = ()
+    gitignore: bool = False
+    jobs: int = 1
+    cache: Optional[Path] = None
 
     @staticmethod
     def from_args(args: _Namespace) -> "WatchParams":
@@ -34,12 +61,48 @@ class WatchParams(NamedTuple):
             args.shell,
             args.single_pass,
             args.poll_rate,
+            args.backend,
+            args.settle,
+            args.restart,
+            args.grace,
+            tuple(args.include),
+            tuple(args.exclude),
+            args.gitignore,
+            args.jobs,
+            args.cache,
         )
 
+    @staticmethod
+    def config_conflicts(args: _Namespace) -> List[str]:
+        """
+        Get the arguments that were set (to anything other than their
+        default) but don't apply when rules come from a configuration file.
+        """
+
+        parser = _ArgumentParser()
+        WatchParams.add_args(parser)
+        defaults = vars(parser.parse_args([]))
+
+        return [
+            name if name in POSITIONAL_ARGS else f"--{name.replace('_', '-')}"
+            for name, default in defaults.items()
+            if name not in CONFIG_ARGS and getattr(args, name) != default
+        ]
+
     @staticmethod
     def add_args(parser: _ArgumentParser) -> None:
         """Add command-line argument options."""
 
+        parser.add_argument(
+            "-j",
+            "--jobs",
+            default=1,
+            type=positive_int,
+            help=(
+                "maximum number of command runs at once "
+                "(default: %(default)s)"
+            ),
+        )
         parser.add_argument(
             "-p",
             "--poll-rate",
@@ -47,6 +110,66 @@ class WatchParams(NamedTuple):
             default=DEFAULT_POLL_RATE,
             help="poll period in seconds (default: %(default)ss)",
         )
+        parser.add_argument(
+            "--settle",
+            type=float,
+            default=DEFAULT_SETTLE,
+            help=(
+                "seconds without new changes to wait for before "
+                "running the command (default: %(default)ss)"
+            ),
+        )
+        parser.add_argument(
+            "-r",
+            "--restart",
+            action="store_true",
+            help=(
+                "restart the command (if it's still running) "
+                "when files change"
+            ),
+        )
+        parser.add_argument(
+            "--grace",
+            type=float,
+            default=DEFAULT_GRACE,
+            help=(
+                "seconds to wait for a terminated command to exit "
+                "before killing it (default: %(default)ss)"
+            ),
+        )
+        parser.add_argument(
+            "-b",
+            "--backend",
+            choices=BACKENDS,
+            default="auto",
+            help=(
+                "how to detect file changes, 'auto' uses inotify "
+                "when available (default: %(default)s)"
+            ),
+        )
+        parser.add_argument(
+            "--include",
+            action="append",
+            default=[],
+            metavar="GLOB",
+            help="only watch files matching this pattern (can be repeated)",
+        )
+        parser.add_argument(
+            "--exclude",
+            action="append",
+            default=[],
+            metavar="GLOB",
+            help=(
+                "don't watch (or traverse) paths matching "
+                "this pattern (can be repeated)"
+            ),
+        )
+        parser.add_argument(
+            "-g",
+            "--gitignore",
+            action="store_true",
+            help="also exclude paths ignored by the directory's '.gitignore'",
+        )
         parser.add_argument(
             "-s",
             "--shell",
@@ -69,6 +192,37 @@ class WatchParams(NamedTuple):
             ),
         )
         parser.add_argument(
-            "directory", type=Path, help="directory to watch for file changes"
+            "--cache",
+            type=Path,
+            help=(
+                "persist file information to this file (so that changes "
+                "made while not watching are detected), by default file "
+                "information is only kept in memory"
+            ),
+        )
+        parser.add_argument(
+            "-c",
+            "--config",
+            type=Path,
+            help=(
+                "a file with rules for watching any number of directories "
+                "(instead of a directory and command), other options can't "
+                "be combined with this one (except for '--single-pass'), "
+                "they're set in the file instead"
+            ),
+        )
+        parser.add_argument(
+            "directory",
+            type=Path,
+            nargs="?",
+            help="directory to watch for file changes",
+        )
+        parser.add_argument(
+            "cmd",
+            nargs="*",
+            help=(
+                "command to run, an argument of '{changed}' is replaced "
+                "with the paths of changed files (which are also provided "
+                "in the 'RCMPY_CHANGED' environment variable)"
+            ),
         )
-        parser.add_argument("cmd", nargs="+", help="command to run")
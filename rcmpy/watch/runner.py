@@ -0,0 +1,283 @@
+"""
+An interface for scheduling watch-command runs.
+"""
+
+# built-in
+from asyncio import FIRST_COMPLETED, CancelledError, Semaphore, Task
+from asyncio import TimeoutError as _TimeoutError
+from asyncio import create_task, get_running_loop
+from asyncio import wait as _wait
+from asyncio import wait_for
+from asyncio.subprocess import Process
+from contextlib import suppress
+from logging import getLogger
+import os
+from pathlib import Path
+import shlex
+import signal
+import sys
+from typing import Any, Dict, Iterable, List, Set
+
+# third-party
+from vcorelib.asyncio.cli import create_subprocess_shell_log
+from vcorelib.asyncio.subprocess import (
+    create_subprocess_exec_log,
+    log_process_info,
+)
+from vcorelib.logging import log_time
+
+# internal
+from rcmpy.watch.params import DEFAULT_GRACE, WatchParams
+from rcmpy.watch.source import EventSource
+
+LOG = getLogger(__name__)
+
+# Changed files are provided to commands with an environment variable and (if
+# present) by replacing a placeholder argument.
+CHANGED_ENV = "RCMPY_CHANGED"
+CHANGED_PLACEHOLDER = "{changed}"
+
+
+def expand_changed(
+    args: Iterable[str], changed: Iterable[Path], shell: bool = False
+) -> List[str]:
+    """Replace placeholder arguments with the paths of changed files."""
+
+    paths = [shlex.quote(str(x)) if shell else str(x) for x in changed]
+
+    result: List[str] = []
+    for arg in args:
+        if arg == CHANGED_PLACEHOLDER:
+            result.extend(paths)
+        else:
+            result.append(arg)
+    return result
+
+
+def send_signal(proc: Process, sig: int, group: bool) -> None:
+    """Send a signal to a process (or its entire process group)."""
+
+    # The process may exit at any point.
+    with suppress(ProcessLookupError):
+        if group:
+            os.killpg(proc.pid, sig)
+        else:
+            proc.send_signal(sig)
+
+
+async def terminate(proc: Process, grace: float, group: bool = False) -> None:
+    """
+    Ask a process to terminate, then kill it if it doesn't exit within a grace
+    period.
+    """
+
+    if proc.returncode is not None:
+        return
+
+    LOG.info("Terminating process %d.", proc.pid)
+    send_signal(proc, signal.SIGTERM, group)
+
+    try:
+        await wait_for(proc.wait(), grace)
+    except _TimeoutError:
+        LOG.warning(
+            "Process %d didn't exit within %ss, killing it.", proc.pid, grace
+        )
+        send_signal(proc, getattr(signal, "SIGKILL", signal.SIGTERM), group)
+        await proc.wait()
+
+
+async def command(
+    *args: str,
+    shell: bool = False,
+    grace: float = DEFAULT_GRACE,
+    group: bool = False,
+    changed: Iterable[Path] = None,
+) -> int:
+    """
+    Run a subprocess and return the return code. If this task is cancelled,
+    the process is terminated. Running the process in its own process group
+    allows any processes it starts to be terminated too.
+    """
+
+    kwargs: Dict[str, Any] = {}
+
+    if changed is not None:
+        changed = sorted(changed)
+        args = tuple(expand_changed(args, changed, shell=shell))
+        kwargs["env"] = {
+            **os.environ,
+            CHANGED_ENV: os.pathsep.join(str(x) for x in changed),
+        }
+
+    group = group and sys.platform != "win32"
+    if group:
+        kwargs["start_new_session"] = True
+
+    if shell:
+        proc = await create_subprocess_shell_log(LOG, " ".join(args), **kwargs)
+    else:
+        proc = await create_subprocess_exec_log(LOG, *args, **kwargs)
+
+    name = log_process_info(*args)[0]
+
+    try:
+        with log_time(LOG, "Process '%s' (%d)", name, proc.pid):
+            code = await proc.wait()
+    except CancelledError:
+        await terminate(proc, grace, group=group)
+        raise
+    finally:
+        if proc.returncode is not None:
+            LOG.info(
+                "Process '%s' (%d) exited %d.", name, proc.pid, proc.returncode
+            )
+
+    return code
+
+
+class CommandRunner:
+    """
+    A class for running a watch command in response to file changes. Changes
+    are coalesced until no new changes arrive for a 'settle' period, and only
+    a limited number of runs (one by default) happen at a time. Changes that
+    arrive while the limit is reached result in a single follow-up run (or
+    restart the command in 'restart' mode).
+    """
+
+    def __init__(
+        self, params: WatchParams, semaphore: Semaphore = None
+    ) -> None:
+        """Initialize this instance."""
+
+        self.params = params
+        self.semaphore = semaphore
+        self.pending: Set[Path] = set()
+        self.last_change = 0.0
+        self.tasks: Dict["Task[int]", Set[Path]] = {}
+        self.restarting = False
+        self.runs = 0
+
+    @property
+    def running(self) -> bool:
+        """Determine if a command is currently running."""
+        return bool(self.tasks)
+
+    def add(self, changed: Set[Path]) -> None:
+        """Add changed files."""
+
+        if changed:
+            self.pending |= changed
+            self.last_change = get_running_loop().time()
+
+    def settle_remaining(self) -> float:
+        """Get the time remaining until pending changes are settled."""
+
+        return max(
+            0.0,
+            self.params.settle
+            - (get_running_loop().time() - self.last_change),
+        )
+
+    def timeout(self) -> float:
+        """Get the maximum time to wait before servicing this runner."""
+
+        timeout = self.params.poll_rate
+        if self.pending and len(self.tasks) < self.params.jobs:
+            timeout = min(timeout, self.settle_remaining())
+        return timeout
+
+    def _reap(self) -> None:
+        """Handle the completion of previous runs."""
+
+        for task in [x for x in self.tasks if x.done()]:
+            del self.tasks[task]
+            if not task.cancelled():
+                code = task.result()
+                if code != 0:
+                    LOG.warning("Command exited %d.", code)
+
+        if not self.tasks:
+            self.restarting = False
+
+    async def _run(self, changed: Set[Path]) -> int:
+        """Run the command (once a global run slot is available)."""
+
+        if self.semaphore is not None:
+            async with self.semaphore:
+                return await self._command(changed)
+
+        return await self._command(changed)
+
+    async def _command(self, changed: Set[Path]) -> int:
+        """Run the command."""
+
+        return await command(
+            *self.params.cmd,
+            shell=self.params.shell,
+            grace=self.params.grace,
+            group=self.params.restart,
+            changed=changed,
+        )
+
+    def start(self) -> None:
+        """Start a command run for all pending changes."""
+
+        changed = self.pending
+        self.pending = set()
+        self.runs += 1
+        self.tasks[create_task(self._run(changed))] = changed
+
+    def service(self) -> None:
+        """Start a command run if changes have settled."""
+
+        self._reap()
+
+        # Wait for restarted runs to exit before starting new ones.
+        if not self.pending or self.settle_remaining() or self.restarting:
+            return
+
+        if len(self.tasks) < self.params.jobs:
+            self.start()
+
+        # Cancel current runs, a new one will start once they exit.
+        elif self.params.restart:
+            LOG.info("Restarting command.")
+            self.restarting = True
+            for task, changed in self.tasks.items():
+                task.cancel()
+
+                # The next run also needs to handle these changes.
+                self.pending |= changed
+
+    async def wait(self, source: EventSource) -> None:
+        """
+        Wait for file changes, the settle period to elapse or a current run
+        to complete (whichever happens first).
+        """
+        await wait_any(source, [self])
+
+    async def finish(self, cancel: bool = False) -> None:
+        """Wait for (or cancel) current runs, if there are any."""
+
+        if self.tasks:
+            if cancel:
+                for task in self.tasks:
+                    task.cancel()
+            await _wait(set(self.tasks))
+        self._reap()
+
+
+async def wait_any(source: EventSource, runners: List[CommandRunner]) -> None:
+    """
+    Wait for file changes, any runner's settle period to elapse or any run to
+    complete (whichever happens first).
+    """
+
+    waiter = create_task(source.wait(min(x.timeout() for x in runners)))
+    tasks: Set["Task[Any]"] = {waiter}
+    for runner in runners:
+        tasks.update(runner.tasks)
+
+    await _wait(tasks, return_when=FIRST_COMPLETED)
+    waiter.cancel()
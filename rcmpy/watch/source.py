@@ -0,0 +1,115 @@
+"""
+An interface for sources of file-system change events.
+"""
+
+# built-in
+from abc import ABC, abstractmethod
+from asyncio import sleep
+from contextlib import ExitStack
+from logging import getLogger
+from pathlib import Path
+from typing import Set
+
+# third-party
+from vcorelib.paths.info_cache import (
+    FileChanged,
+    FileInfoManager,
+    file_info_cache,
+)
+
+# internal
+from rcmpy.watch.filters import PathFilter
+from rcmpy.watch.params import WatchParams
+
+LOG = getLogger(__name__)
+
+
+class EventSource(ABC):
+    """
+    A base class for sources of file-system change events. Change detection
+    is done by a file-info manager (files are only considered changed if they
+    were created, removed or their contents changed), sources determine which
+    files need to be checked and when.
+    """
+
+    def __init__(
+        self,
+        params: WatchParams,
+        stack: ExitStack,
+        path_filter: PathFilter = None,
+    ) -> None:
+        """Initialize this instance."""
+
+        if path_filter is None:
+            path_filter = PathFilter.from_params(params)
+
+        self.params = params
+        self.filter = path_filter
+        self.changed: Set[Path] = set()
+
+        # File information is only persisted if a cache file is specified.
+        if params.cache is not None:
+            self.files = stack.enter_context(
+                file_info_cache(
+                    params.cache,
+                    self._poll_cb,
+                    logger=LOG,
+                    check_contents=params.check_contents,
+                )
+            )
+        else:
+            self.files = FileInfoManager(
+                self._poll_cb, logger=LOG, check_contents=params.check_contents
+            )
+
+    def _poll_cb(self, change: FileChanged) -> bool:
+        """Aggregate paths of files that have changed."""
+
+        info = change.new if change.new is not None else change.old
+        assert info is not None
+        self.changed.add(info.path)
+        return True
+
+    def scan(self, directory: Path = None) -> None:
+        """
+        Check every (allowed) file in a directory (default: all watched
+        directories) for changes.
+        """
+
+        if directory is None:
+            directories = self.filter.roots
+            self.files.poll_existing(base=self.params.base)
+        else:
+            directories = [directory]
+
+        for root in directories:
+            for path in self.filter.files(root):
+                self.files.poll_file(path, base=self.params.base)
+
+    @abstractmethod
+    def _poll(self) -> None:
+        """Check any files that may have changed."""
+
+    def poll(self) -> Set[Path]:
+        """Get the paths of files that changed since the last poll."""
+
+        self._poll()
+        result = self.changed
+        self.changed = set()
+        return result
+
+    @abstractmethod
+    async def wait(self, timeout: float) -> None:
+        """Wait (up to some timeout) for files to possibly change."""
+
+
+class PollingSource(EventSource):
+    """An event source that periodically checks every file."""
+
+    def _poll(self) -> None:
+        """Check any files that may have changed."""
+        self.scan()
+
+    async def wait(self, timeout: float) -> None:
+        """Wait (up to some timeout) for files to possibly change."""
+        await sleep(timeout)
@@ -0,0 +1,107 @@
+"""
+An interface for implementing file-system watching tasks.
+"""
+
+# built-in
+from asyncio import Event, Semaphore, get_event_loop
+from contextlib import ExitStack
+from logging import getLogger
+
+# third-party
+from vcorelib.asyncio import run_handle_stop
+
+# internal
+from rcmpy.paths.cache import clean_stale_caches
+from rcmpy.watch.filters import PathFilter, PathFilters
+from rcmpy.watch.inotify import InotifySource, inotify_available
+from rcmpy.watch.params import WatchParams
+from rcmpy.watch.runner import CommandRunner, wait_any
+from rcmpy.watch.source import EventSource, PollingSource
+
+LOG = getLogger(__name__)
+
+
+def create_source(
+    params: WatchParams,
+    stack: ExitStack,
+    path_filter: PathFilter = None,
+) -> EventSource:
+    """Create a file-system event source based on watch parameters."""
+
+    if params.backend != "poll":
+        if inotify_available():
+            try:
+                return InotifySource(params, stack, path_filter=path_filter)
+            except OSError as exc:
+                LOG.warning("Couldn't use inotify (%s), polling instead.", exc)
+
+        elif params.backend == "inotify":
+            LOG.warning("inotify isn't available, polling instead.")
+
+    return PollingSource(params, stack, path_filter=path_filter)
+
+
+async def entry(stop_sig: Event, *rules: WatchParams, jobs: int = 0) -> int:
+    """
+    The async entry-point for the watch command. Any number of rules (each
+    with their own directory and command) share a single event source. The
+    total number of commands running at once can be limited.
+    """
+
+    clean_stale_caches(LOG)
+
+    # Source-wide parameters come from the first rule.
+    params = rules[0]
+
+    filters = [PathFilter.from_params(x) for x in rules]
+    semaphore = Semaphore(jobs) if jobs > 0 else None
+    runners = [CommandRunner(x, semaphore=semaphore) for x in rules]
+
+    with ExitStack() as stack:
+        source = create_source(
+            params,
+            stack,
+            path_filter=(
+                filters[0] if len(filters) == 1 else PathFilters(filters)
+            ),
+        )
+
+        while not stop_sig.is_set():
+            changed = source.poll()
+
+            for runner, path_filter in zip(runners, filters):
+                runner.add(
+                    changed
+                    if len(runners) == 1
+                    else set(x for x in changed if path_filter.selects(x))
+                )
+
+                if params.single_pass:
+                    if runner.pending:
+                        runner.start()
+                else:
+                    runner.service()
+
+            if params.single_pass:
+                stop_sig.set()
+            else:
+                await wait_any(source, runners)
+
+        # Let any in-progress runs complete (unless they would be restarted).
+        for runner in runners:
+            await runner.finish(
+                cancel=runner.params.restart and not params.single_pass
+            )
+    return 0
+
+
+def watch(*rules: WatchParams, jobs: int = 0) -> int:
+    """Watch directories for changes."""
+
+    eloop = get_event_loop()
+    stop_sig = Event()
+    return run_handle_stop(
+        stop_sig,
+        entry(stop_sig, *rules, jobs=jobs),
+        eloop=eloop,
+    )
@@ -2,9 +2,16 @@
 Test the 'commands.apply' module.
 """
 
+# built-in
+import json
+import logging
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
 # module under test
 from rcmpy import PKG_NAME
 from rcmpy.entry import main as rcmpy_main
+from rcmpy.metrics import LOAD_PHASES
 
 # internal
 from tests.resources import file_removed, scenario
@@ -42,8 +49,97 @@ def test_apply_command_simple():
         assert rcmpy_main([PKG_NAME, "apply"]) == 0
 
 
+def test_apply_command_fingerprints(caplog):
+    """Test that 'apply' skips files with unchanged inputs."""
+
+    with scenario("simple", variant="test"):
+        assert rcmpy_main([PKG_NAME, "apply"]) == 0
+
+        # Nothing should be rendered or updated again.
+        caplog.clear()
+        with caplog.at_level(logging.INFO):
+            assert rcmpy_main([PKG_NAME, "apply"]) == 0
+        assert "Rendered" not in caplog.text
+        assert "->" not in caplog.text
+
+        # Unless outputs are forcibly rendered (but outputs that are already
+        # correct still aren't updated).
+        caplog.clear()
+        with caplog.at_level(logging.INFO):
+            assert rcmpy_main([PKG_NAME, "apply", "-f"]) == 0
+        assert "Rendered" in caplog.text
+        assert "->" not in caplog.text
+
+        # Render concurrently.
+        assert rcmpy_main([PKG_NAME, "apply", "-f", "-j", "4"]) == 0
+        assert rcmpy_main([PKG_NAME, "apply", "-f", "-d", "-j", "4"]) == 0
+
+        # Synchronize outputs to disk.
+        assert (
+            rcmpy_main([PKG_NAME, "apply", "-f", "--durability", "directory"])
+            == 0
+        )
+
+
 def test_apply_command_missing_template():
     """Test the 'apply' command against the 'missing_template' scenario."""
 
     with scenario("missing_template"):
         assert rcmpy_main([PKG_NAME, "apply"]) != 0
+
+
+def test_apply_command_metrics():
+    """Test writing metrics about applying changes."""
+
+    with (
+        TemporaryDirectory() as tmp,
+        scenario("simple", variant="test") as root,
+    ):
+        # Ensure that at least one output is copied.
+        root.joinpath("rcmpy-out", "basic.txt").unlink(missing_ok=True)
+
+        metrics = Path(tmp, "metrics.json")
+        prometheus = Path(tmp, "rcmpy.prom")
+        args = [
+            PKG_NAME,
+            "apply",
+            "--metrics",
+            str(metrics),
+            "--prometheus",
+            str(prometheus),
+        ]
+
+        assert rcmpy_main(args) == 0
+        data = json.loads(metrics.read_text(encoding="utf-8"))
+        assert data["evaluated"] == 8
+        assert data["skipped_platform"] == 2
+        assert data["linked"] + data["copied"] + data["unchanged"] == 6
+        assert data["copied"] > 0
+        assert data["bytes_written"] > 0
+        assert data["rendered"] > 0
+        assert set(data["durations"]) == set(LOAD_PHASES) | {
+            "apply",
+            "pending",
+            "render",
+            "update",
+        }
+
+        text = prometheus.read_text(encoding="utf-8")
+        assert 'rcmpy_apply_files{outcome="evaluated"} 8' in text
+        assert 'rcmpy_apply_phase_seconds{phase="apply"}' in text
+        assert 'rcmpy_apply_phase_seconds{phase="load_state"}' in text
+        assert f"rcmpy_apply_templates_rendered {data['rendered']}" in text
+        assert 'outcome="rendered"' not in text
+
+        # Nothing changes on a second run.
+        assert rcmpy_main(args) == 0
+        data = json.loads(metrics.read_text(encoding="utf-8"))
+        assert data["unchanged"] == 6
+        assert data["rendered"] == 0
+        assert data["bytes_written"] == 0
+
+    with TemporaryDirectory() as tmp, scenario("missing_template"):
+        metrics = Path(tmp, "metrics.json")
+        assert rcmpy_main([PKG_NAME, "apply", "--metrics", str(metrics)]) != 0
+        data = json.loads(metrics.read_text(encoding="utf-8"))
+        assert data["missing_templates"] > 0
@@ -0,0 +1,65 @@
+"""
+Test the 'commands.clean' module.
+"""
+
+# built-in
+import os
+import subprocess
+import sys
+
+# module under test
+from rcmpy import PKG_NAME
+from rcmpy.entry import main as rcmpy_main
+from rcmpy.paths import default_cache_directory
+from rcmpy.paths.blobs import blob_root, store_blob
+from rcmpy.paths.cache import bytecode_cache_root
+
+# internal
+from tests.resources import scenario
+
+
+def test_clean_command_basic():
+    """Test basic usages of the 'clean' command."""
+
+    with scenario("simple", variant="test") as root:
+        # Populate the compiled-template cache, then use it.
+        assert rcmpy_main([PKG_NAME, "apply", "-f"]) == 0
+        assert any(bytecode_cache_root().rglob("*.cache"))
+        assert rcmpy_main([PKG_NAME, "apply", "-f"]) == 0
+
+        assert rcmpy_main([PKG_NAME, "clean", "--templates"]) == 0
+        assert not bytecode_cache_root().exists()
+
+        # Create a blob that no output uses (blobs are only written once).
+        blobs = blob_root(root.joinpath("build"))
+        stale, written = store_blob(blobs, "stale")
+        assert written == len("stale")
+        assert store_blob(blobs, "stale") == (stale, 0)
+        assert rcmpy_main([PKG_NAME, "clean", "--blobs"]) == 0
+        assert not stale.exists()
+
+        # Blobs in use are kept.
+        assert any(blobs.rglob("*"))
+
+        # Cleaning with nothing cached is fine.
+        assert rcmpy_main([PKG_NAME, "clean"]) == 0
+
+
+def test_clean_command_watch():
+    """Test cleaning up caches left behind by watch tasks."""
+
+    with scenario("simple"):
+        # Find a process identifier that (almost certainly) isn't in use.
+        with subprocess.Popen([sys.executable, "--version"]) as proc:
+            proc.wait()
+
+        cache = default_cache_directory()
+        cache.mkdir(parents=True, exist_ok=True)
+        stale = cache.joinpath(f"watch_cache-{proc.pid}.json")
+        current = cache.joinpath(f"watch_cache-{os.getpid()}.json")
+        for path in [stale, current]:
+            path.write_text("{}", encoding="utf-8")
+
+        assert rcmpy_main([PKG_NAME, "clean", "--watch"]) == 0
+        assert not stale.exists()
+        assert current.exists()
@@ -2,6 +2,13 @@
 Test the 'commands.watch' module.
 """
 
+# built-in
+import json
+import os
+from pathlib import Path
+import sys
+from tempfile import TemporaryDirectory
+
 # module under test
 from rcmpy import PKG_NAME
 from rcmpy.entry import main as rcmpy_main
@@ -17,3 +24,169 @@ def test_watch_command_basic():
 
     with scenario("simple"):
         assert rcmpy_main(args + ["-i", ".", "--", "python", "--version"]) == 0
+
+        for backend in ["poll", "inotify"]:
+            assert (
+                rcmpy_main(
+                    args
+                    + ["-i", "-b", backend, ".", "--", "python", "--version"]
+                )
+                == 0
+            )
+
+
+def test_watch_command_changed():
+    """Test that commands are provided the paths of changed files."""
+
+    with TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        output = root.joinpath("output.txt")
+        watched = root.joinpath("watched")
+        watched.mkdir()
+        watched.joinpath("a.txt").write_text("a", encoding="utf-8")
+        watched.joinpath("b.log").write_text("b")
+
+        script = (
+            "import os, sys; "
+            f"open({str(output)!r}, 'w').write("
+            "os.environ['RCMPY_CHANGED'] + '|' + ','.join(sys.argv[1:]))"
+        )
+
+        assert (
+            rcmpy_main(
+                [
+                    PKG_NAME,
+                    "watch",
+                    "-i",
+                    "--exclude",
+                    "*.log",
+                    str(watched),
+                    "--",
+                    sys.executable,
+                    "-c",
+                    script,
+                    "{changed}",
+                ]
+            )
+            == 0
+        )
+
+        expected = str(watched.joinpath("a.txt").resolve())
+        assert output.read_text(encoding="utf-8") == f"{expected}|{expected}"
+
+
+def test_watch_command_config():
+    """Test watching many directories with a configuration file."""
+
+    assert rcmpy_main([PKG_NAME, "watch", "-i"]) == 1
+
+    # At least one run must be allowed at once.
+    for jobs in ["0", "-1", "a"]:
+        assert rcmpy_main([PKG_NAME, "watch", "-i", "-j", jobs, "."]) == 2
+
+    with TemporaryDirectory() as tmp:
+        root = Path(tmp)
+
+        for path in ["docs/index.md", "src/a.py", "src/gen/b.py"]:
+            root.joinpath(path).parent.mkdir(parents=True, exist_ok=True)
+            root.joinpath(path).write_text("data", encoding="utf-8")
+
+        def rule(directory: str, output: str, **kwargs) -> dict:
+            """Create a rule that records the files that changed."""
+
+            return {
+                "directory": directory,
+                "command": [
+                    sys.executable,
+                    "-c",
+                    (
+                        "import os; "
+                        f"open({str(root.joinpath(output))!r}, 'w')"
+                        ".write(os.environ['RCMPY_CHANGED'])"
+                    ),
+                ],
+                **kwargs,
+            }
+
+        config = root.joinpath("watch.json")
+        config.write_text(
+            json.dumps(
+                {
+                    "jobs": 1,
+                    "rules": [
+                        rule("docs", "docs.txt"),
+                        rule("src", "src.txt", exclude=["gen"]),
+                        rule(".", "all.txt", include=["*.py"]),
+                    ],
+                }
+            ),
+            encoding="utf-8",
+        )
+
+        # Options (and arguments) that rules set are rejected.
+        for args in [
+            ["--backend", "poll"],
+            ["-p", "1.0"],
+            ["--exclude", "docs"],
+            ["-j", "2"],
+            [".", "echo"],
+        ]:
+            assert (
+                rcmpy_main([PKG_NAME, "watch", "-i", "-c", str(config), *args])
+                == 1
+            )
+
+        assert rcmpy_main([PKG_NAME, "watch", "-i", "-c", str(config)]) == 0
+
+        def changed(output: str) -> set:
+            """Get the relative paths that a rule's command was given."""
+
+            return set(
+                Path(x).relative_to(root.resolve()).as_posix()
+                for x in root.joinpath(output)
+                .read_text(encoding="utf-8")
+                .split(os.pathsep)
+            )
+
+        assert changed("docs.txt") == {"docs/index.md"}
+        assert changed("src.txt") == {"src/a.py"}
+        assert changed("all.txt") == {"src/a.py", "src/gen/b.py"}
+
+
+def test_watch_command_cache():
+    """Test persisting file information between watch tasks."""
+
+    with TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        output = root.joinpath("runs.txt")
+        watched = root.joinpath("watched")
+        watched.mkdir()
+        watched.joinpath("a.txt").write_text("a", encoding="utf-8")
+
+        args = [
+            PKG_NAME,
+            "watch",
+            "-i",
+            "--cache",
+            str(root.joinpath("cache.json")),
+            str(watched),
+            "--",
+            sys.executable,
+            "-c",
+            f"open({str(output)!r}, 'a').write('run\\n')",
+        ]
+
+        def runs() -> int:
+            """Get the number of times the command ran."""
+            return len(output.read_text(encoding="utf-8").splitlines())
+
+        assert rcmpy_main(args) == 0
+        assert runs() == 1
+
+        # Nothing changed since the last invocation.
+        assert rcmpy_main(args) == 0
+        assert runs() == 1
+
+        watched.joinpath("a.txt").write_text("b", encoding="utf-8")
+        assert rcmpy_main(args) == 0
+        assert runs() == 2
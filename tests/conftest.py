@@ -0,0 +1,23 @@
+"""
+Test configuration shared by all tests.
+"""
+
+# built-in
+from typing import Iterator
+
+# third-party
+from pytest import fixture
+
+# module under test
+from rcmpy.paths import override_environ_tempdir
+
+
+@fixture(scope="session", autouse=True)
+def isolated_runtime_directory() -> Iterator[None]:
+    """
+    Use a temporary runtime directory, so that commands are never forwarded
+    to a server that happens to be running outside of the tests.
+    """
+
+    with override_environ_tempdir("XDG_RUNTIME_DIR"):
+        yield
@@ -0,0 +1,32 @@
+"""
+Test the 'environment.base' module.
+"""
+
+# built-in
+from unittest.mock import patch
+
+# module under test
+from rcmpy.config import Config
+from rcmpy.config.file import compile_condition
+from rcmpy.environment import load_environment
+
+# internal
+from tests.resources import scenario
+
+
+def test_manifest_snapshot():
+    """Test that validated manifest data is loaded from the cache."""
+
+    with scenario("simple"):
+        with load_environment() as env:
+            files = env.config.files
+            assert files
+
+        # The manifest doesn't need to be validated again.
+        with patch.object(Config, "validate", side_effect=AssertionError):
+            with load_environment() as env:
+                assert env.config.files == files
+                assert env.state.decoded.hits >= 1
+
+    # Conditions are only compiled once.
+    assert compile_condition("True") is compile_condition("True")
@@ -0,0 +1,72 @@
+"""
+Test the 'environment.tracking' module.
+"""
+
+# third-party
+from jinja2 import Environment
+
+# module under test
+from rcmpy.environment.tracking import (
+    TrackingContext,
+    minimize,
+    resolve,
+    track_reads,
+)
+
+
+def render_reads(source: str, **data) -> set:
+    """Render a template and return the key paths of data it read."""
+
+    env = Environment()
+    env.context_class = TrackingContext
+
+    with track_reads() as reads:
+        env.from_string(source).render(data)
+
+    return reads
+
+
+def test_tracking_key_paths():
+    """Test that reads of nested template data are recorded."""
+
+    data = {"a": {"b": {"c": 1, "d": 2}, "e": 3}, "f": 4, "g": {"h": 5}}
+
+    assert render_reads("{{a.b.c}} {{a['e']}}", **data) == {
+        ("a", "b", "c"),
+        ("a", "e"),
+    }
+
+    # Using a dictionary as a whole records its path.
+    assert render_reads("{{a.b | tojson}}", **data) == {("a", "b")}
+    assert render_reads(
+        "{% for k, v in g.items() %}{{k}}{{v}}{% endfor %}", **data
+    ) == {("g",)}
+
+    # Missing data is still a dependency.
+    assert render_reads(
+        "{% if a.x is defined or 'y' in g %}{{f}}{% endif %}", **data
+    ) == {("a", "x"), ("g", "y"), ("f",)}
+    assert render_reads("{{a.get('z', 0)}}", **data) == {("a", "z")}
+
+    # Variables set by the template aren't template data.
+    assert render_reads("{% set x = 1 %}{{x}}{{f}}", **data) == {("f",)}
+
+    # Nothing is recorded when tracking isn't active.
+    env = Environment()
+    env.context_class = TrackingContext
+    assert env.from_string("{{a.b.c}}").render(data) == "1"
+
+
+def test_tracking_helpers():
+    """Test key-path helper functions."""
+
+    assert minimize([("a", "b"), ("a",), ("c", "d"), ("c", "e")]) == [
+        ("a",),
+        ("c", "d"),
+        ("c", "e"),
+    ]
+
+    data = {"a": {"b": 1}}
+    assert resolve(data, ("a", "b")) == (True, 1)
+    assert resolve(data, ("a", "c")) == (False, None)
+    assert resolve(data, ("a", "b", "c")) == (False, None)
@@ -0,0 +1,53 @@
+"""
+Test the 'paths.atomic' module.
+"""
+
+# built-in
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+# third-party
+from pytest import raises
+
+# module under test
+from rcmpy.paths.atomic import (
+    Durability,
+    copy_atomic,
+    staged,
+    symlink_atomic,
+    write_atomic,
+)
+
+
+def test_atomic_basic():
+    """Test basic atomic file-creation interfaces."""
+
+    with TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        path = root.joinpath("a.txt")
+
+        for durability in Durability:
+            write_atomic(path, durability.value, durability)
+            assert path.read_text(encoding="utf-8") == durability.value
+
+            copy_atomic(path, root.joinpath("b.txt"), durability)
+            assert (
+                root.joinpath("b.txt").read_text(encoding="utf-8")
+                == durability.value
+            )
+
+            symlink_atomic(path, root.joinpath("c.txt"), durability)
+            assert root.joinpath("c.txt").resolve() == path.resolve()
+
+        # Failures leave the original file (and no temporary files) behind.
+        with raises(RuntimeError):
+            with staged(path) as tmp:
+                tmp.write_text("new", encoding="utf-8")
+                raise RuntimeError("failed")
+
+        assert path.read_text(encoding="utf-8") == Durability.DIRECTORY.value
+        assert sorted(x.name for x in root.iterdir()) == [
+            "a.txt",
+            "b.txt",
+            "c.txt",
+        ]
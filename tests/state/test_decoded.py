@@ -0,0 +1,89 @@
+"""
+Test the 'state.decoded' module.
+"""
+
+# built-in
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+# third-party
+from vcorelib.io import ARBITER
+
+# module under test
+from rcmpy.state.decoded import DecodeCache, decode_cache
+
+
+def decode_directory(path: Path):
+    """Create a decoder for a directory."""
+
+    return lambda loaded: ARBITER.decode_directory(
+        path, includes_key="includes", files_loaded=loaded
+    )
+
+
+def test_decode_cache_basic():
+    """Test basic interactions with a decoded-data cache."""
+
+    with TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        data = root.joinpath("data")
+        data.mkdir()
+
+        include = root.joinpath("include.yaml")
+        include.write_text("c: 3\n", encoding="utf-8")
+        data.joinpath("a.yaml").write_text(
+            "a: 1\nincludes: [../include.yaml]\n", encoding="utf-8"
+        )
+
+        cache = DecodeCache({})
+
+        def load(salt: str = "") -> dict:
+            """Load the directory's data."""
+
+            result = cache.load(
+                "data", decode_directory(data), directories=[data], salt=salt
+            )
+            assert result is not None
+            return result.data
+
+        assert load() == {"a": {"a": 1, "c": 3}}
+        assert (cache.hits, cache.misses) == (0, 1)
+
+        # Cached data can be modified without affecting the cache.
+        load()["a"]["a"] = 2
+        assert load() == {"a": {"a": 1, "c": 3}}
+        assert (cache.hits, cache.misses) == (2, 1)
+
+        # Touching a file doesn't invalidate data, changing it does (once the
+        # index is checked against the file system again).
+        os.utime(include, ns=(0, 0))
+        cache.index.invalidate()
+        assert load() == {"a": {"a": 1, "c": 3}}
+        assert cache.misses == 1
+        include.write_text("c: 4\n", encoding="utf-8")
+        assert load() == {"a": {"a": 1, "c": 3}}
+        cache.index.invalidate()
+        assert load() == {"a": {"a": 1, "c": 4}}
+        assert cache.misses == 2
+
+        # New files and different salts invalidate data.
+        data.joinpath("b.yaml").write_text("b: 2\n", encoding="utf-8")
+        cache.index.invalidate()
+        assert load()["b"] == {"b": 2}
+        assert cache.misses == 3
+        assert load("salt")["b"] == {"b": 2}
+        assert cache.misses == 4
+
+        # Removing files invalidates data.
+        data.joinpath("b.yaml").unlink()
+        cache.index.invalidate()
+        assert "b" not in load("salt")
+        assert cache.misses == 5
+
+        # Data persists across instances.
+        with decode_cache(root) as cache:
+            assert load() == {"a": {"a": 1, "c": 4}}
+        with decode_cache(root) as cache:
+            assert load() == {"a": {"a": 1, "c": 4}}
+            assert (cache.hits, cache.misses) == (1, 0)
@@ -0,0 +1,84 @@
+"""
+Test the 'state.index' module.
+"""
+
+# built-in
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+# module under test
+from rcmpy.state.index import RACY_NS, ChangeIndex
+
+
+def age(path: Path) -> None:
+    """Make a file's (or directory's) modification time old enough to trust."""
+
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - 2 * RACY_NS))
+
+
+def test_change_index_basic():
+    """Test basic interactions with a change index."""
+
+    with TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        sub = root.joinpath("sub")
+        sub.mkdir()
+
+        a_file = root.joinpath("a.txt")
+        a_file.write_text("a", encoding="utf-8")
+        b_file = sub.joinpath("b.txt")
+        b_file.write_text("b", encoding="utf-8")
+        for path in [a_file, b_file, sub, root]:
+            age(path)
+
+        data: dict = {}
+        index = ChangeIndex(data)
+
+        assert set(index.files_in(root)) == {a_file, b_file}
+        assert index.changed == {a_file, b_file}
+        assert (index.listed, index.hashed) == (2, 2)
+        assert index.digest(root.joinpath("missing.txt")) is None
+
+        # Nothing is listed or hashed again if nothing changed.
+        index = ChangeIndex(data)
+        assert set(index.files_in(root)) == {a_file, b_file}
+        assert not index.changed
+        assert (index.listed, index.hashed) == (0, 0)
+
+        # Touching a file re-hashes it (but doesn't count as a change).
+        age(a_file)
+        index = ChangeIndex(data)
+        digest = index.digest(a_file)
+        assert index.hashed == 1
+        assert set(index.files_in(root)) == {a_file, b_file}
+        assert not index.changed
+
+        # Modifying a file in place is detected (without listing its
+        # directory again).
+        a_file.write_text("aa", encoding="utf-8")
+        age(a_file)
+        index = ChangeIndex(data)
+        index.files_in(root)
+        assert index.changed == {a_file}
+        assert index.digest(a_file) != digest
+        assert index.listed == 0
+
+        # Queries reflect the file system when a path was first checked
+        # (until the index is invalidated).
+        c_file = sub.joinpath("c.txt")
+        c_file.write_text("c", encoding="utf-8")
+        assert c_file not in index.files_in(root)
+        index.invalidate()
+        assert c_file in index.files_in(root)
+        assert c_file in index.changed
+
+        # Removed files (and directories) are detected.
+        c_file.unlink()
+        b_file.unlink()
+        sub.rmdir()
+        index = ChangeIndex(data)
+        assert index.files_in(root) == [a_file]
+        assert index.changed == {b_file, c_file}
+        assert str(sub) not in index.directories
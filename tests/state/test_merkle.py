@@ -0,0 +1,69 @@
+"""
+Test the 'state.merkle' module.
+"""
+
+# built-in
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+# module under test
+from rcmpy.state import State
+from rcmpy.state.merkle import (
+    changed_paths,
+    digest_tree,
+    file_tree,
+    tree_digest,
+)
+
+
+def test_changed_paths():
+    """Test attributing changes between digest trees to key paths."""
+
+    old = digest_tree({"a": {"b": 1, "c": {"d": 2}}, "e": 3})
+    assert changed_paths(old, old) == set()
+    assert changed_paths(None, None) == set()
+    assert changed_paths(None, old) == {()}
+
+    new = digest_tree({"a": {"b": 1, "c": {"d": 3}}, "f": 3})
+    assert changed_paths(old, new) == {("a", "c", "d"), ("e",), ("f",)}
+
+    # A leaf becoming a dictionary changes the whole key path.
+    new = digest_tree({"a": {"b": {"x": 1}, "c": {"d": 2}}, "e": 3})
+    assert changed_paths(old, new) == {("a", "b")}
+
+
+def test_file_tree():
+    """Test building digest trees from file digests."""
+
+    root = Path("root")
+    tree = file_tree(root, {"root/a/b.yaml": "1", "root/c.yaml": "2"})
+    assert tree_digest(tree) == tree_digest(
+        file_tree(root, {"root/c.yaml": "2", "root/a/b.yaml": "1"})
+    )
+    assert changed_paths(
+        tree, file_tree(root, {"root/a/b.yaml": "3", "root/c.yaml": "2"})
+    ) == {("a", "b.yaml")}
+
+
+def test_state_changes():
+    """Test that state attributes changes to key paths."""
+
+    with TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        variables = root.joinpath("variables", "common")
+        variables.mkdir(parents=True)
+
+        path = variables.joinpath("a.yaml")
+        path.write_text("b: {c: 1, d: 2}\ne: 3\n", encoding="utf-8")
+
+        state = State({"directory": tmp}, verify=False)
+        assert state.changes["variables"] == {("a",)}
+        assert state.variables_new
+        assert not state.configs_new
+
+        state.reload()
+        assert not state.variables_new
+
+        path.write_text("b: {c: 1, d: 30}\ne: 3\n", encoding="utf-8")
+        state.reload()
+        assert state.changes["variables"] == {("a", "b", "d")}
@@ -0,0 +1,29 @@
+"""
+Test the 'state' module.
+"""
+
+# module under test
+from rcmpy.state import load_state
+
+# internal
+from tests.resources import scenario
+
+
+def test_state_digests():
+    """Test that state only keeps digests of configs and variables."""
+
+    with scenario("simple"):
+        with load_state() as state:
+            previous = state.previous
+            assert previous["variables"]
+            assert all(
+                isinstance(x, str) for x in previous["variables"].values()
+            )
+            assert all(
+                isinstance(x, str) for x in previous["configs"].values()
+            )
+
+        with load_state() as state:
+            assert not state.variables_new
+            assert not state.configs_new
+            assert state.previous["variables"] == previous["variables"]
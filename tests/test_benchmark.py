@@ -0,0 +1,50 @@
+"""
+Test the 'benchmark' package.
+"""
+
+# built-in
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+# module under test
+from rcmpy import PKG_NAME
+from rcmpy.benchmark import RepoSpec, compare, generate
+from rcmpy.benchmark.measure import run_step
+from rcmpy.client import NO_SERVER_ENV
+from rcmpy.entry import main as rcmpy_main
+from rcmpy.paths import override_environ_tempdir
+
+
+def test_benchmark_generate():
+    """Test that generated data repositories can be applied."""
+
+    spec = RepoSpec(templates=3, files=5, configs=2, variants=1)
+
+    with TemporaryDirectory() as tmp:
+        repo = generate(Path(tmp), spec)
+
+        with override_environ_tempdir("XDG_STATE_HOME"):
+            with override_environ_tempdir("XDG_CACHE_HOME"):
+                assert rcmpy_main([PKG_NAME, "use", str(repo)]) == 0
+                assert rcmpy_main([PKG_NAME, "apply"]) == 0
+                assert rcmpy_main([PKG_NAME, "variant", "variant_0"]) == 0
+                assert rcmpy_main([PKG_NAME, "apply"]) == 0
+
+        output = repo.joinpath("rcmpy-out")
+        assert len(list(output.iterdir())) == spec.files
+        assert "1000" in output.joinpath("file_0.txt").read_text(
+            encoding="utf-8"
+        )
+
+
+def test_benchmark_measure():
+    """Test measuring a command."""
+
+    result = run_step(["noop"], {NO_SERVER_ENV: "1"})
+    assert result["code"] == 0
+    assert result["process_s"] >= result["wall_s"] > 0.0
+
+    assert compare(
+        {"summary": {"a": {"wall_s": 2.0}, "b": {"wall_s": 0.0}}},
+        {"summary": {"a": {"wall_s": 1.0}, "b": {"wall_s": 1.0}}},
+    ) == {"a": 0.5}
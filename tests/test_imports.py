@@ -0,0 +1,99 @@
+"""
+Test that commands only import the dependencies they need.
+"""
+
+# built-in
+import json
+from os import environ
+from subprocess import DEVNULL, PIPE, run
+from sys import executable
+from typing import Set
+
+# module under test
+from rcmpy import PKG_NAME
+from rcmpy.client import NO_SERVER_ENV
+
+# internal
+from tests.resources import scenario
+
+# Packages (and modules) that are expensive to import.
+HEAVY = {
+    "asyncio",
+    "cerberus",
+    "datazen",
+    "jinja2",
+    f"{PKG_NAME}.environment",
+    f"{PKG_NAME}.state",
+    f"{PKG_NAME}.watch.inotify",
+    f"{PKG_NAME}.watch.task",
+}
+
+# Every command's module is imported to build the argument parser, so
+# they must only import what's needed to register arguments.
+COMMANDS = [
+    "apply",
+    "clean",
+    "dump",
+    "noop",
+    "serve",
+    "use",
+    "variant",
+    "watch",
+]
+
+# Packages that commands must not import when they run.
+RUN_BUDGETS = {
+    "apply": {
+        "asyncio",
+        f"{PKG_NAME}.watch.inotify",
+        f"{PKG_NAME}.watch.task",
+    },
+    "clean": {"asyncio", "datazen", "jinja2", f"{PKG_NAME}.environment"},
+    "use": {"asyncio", "datazen", "jinja2", f"{PKG_NAME}.environment"},
+    "variant": {"asyncio", "datazen", "jinja2", f"{PKG_NAME}.environment"},
+}
+
+SCRIPT = """
+import json
+import sys
+
+from rcmpy.entry import main
+
+try:
+    main(sys.argv)
+except SystemExit:
+    pass
+
+print(json.dumps(sorted(sys.modules)), file=sys.stderr)
+"""
+
+
+def imported(*args: str) -> Set[str]:
+    """Determine which heavy packages a command-line invocation imports."""
+
+    result = run(
+        [executable, "-c", SCRIPT, *args],
+        stdout=DEVNULL,
+        stderr=PIPE,
+        check=True,
+        env={**environ, NO_SERVER_ENV: "1"},
+    )
+    return HEAVY & set(json.loads(result.stderr.splitlines()[-1]))
+
+
+def test_command_help_imports():
+    """Test that parsing arguments doesn't import any heavy packages."""
+
+    for command in COMMANDS:
+        assert imported(command, "-h") == set(), command
+
+
+def test_command_run_imports():
+    """Test that running commands doesn't import packages they don't need."""
+
+    with scenario("simple", variant="test"):
+        for command, budget in RUN_BUDGETS.items():
+            assert not imported(command) & budget, command
+
+        # Applying changes does need to render templates.
+        assert "jinja2" in imported("apply")
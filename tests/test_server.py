@@ -0,0 +1,123 @@
+"""
+Test the 'server' and 'client' modules.
+"""
+
+# built-in
+from argparse import Namespace
+from contextlib import ExitStack
+import json
+from pathlib import Path
+import socket
+from threading import Thread
+from unittest.mock import patch
+
+# third-party
+from pytest import skip
+
+if not hasattr(socket, "AF_UNIX"):
+    skip("Unix sockets aren't available.", allow_module_level=True)
+
+# pylint: disable=wrong-import-position
+
+# module under test
+from rcmpy import PKG_NAME
+from rcmpy.client import (
+    NO_SERVER_ENV,
+    decode_args,
+    encode_args,
+    forward,
+    socket_path,
+)
+from rcmpy.entry import main as rcmpy_main
+from rcmpy.paths import override_environ, override_environ_tempdir
+from rcmpy.server import Server, run_request
+
+# internal
+from tests.resources import scenario
+
+
+def test_encode_args():
+    """Test encoding (and decoding) command-line arguments."""
+
+    args = Namespace(command="use", directory=Path("a", "b"), default=False)
+    data = json.loads(json.dumps(encode_args(args)))
+    assert decode_args(data) == args
+
+
+def test_server_basic(capsys):
+    """Test forwarding commands to a server."""
+
+    with ExitStack() as stack:
+        stack.enter_context(override_environ_tempdir("XDG_RUNTIME_DIR"))
+        path = socket_path()
+
+        # Nothing is forwarded without a server.
+        assert forward(Namespace(command="variant")) is None
+
+        server = stack.enter_context(Server())
+        assert path.is_socket()
+        assert path.stat().st_mode & 0o777 == 0o600
+
+        thread = Thread(target=server.serve_forever, args=(0.01,))
+        thread.start()
+        stack.callback(thread.join)
+        stack.callback(server.shutdown)
+
+        handled = stack.enter_context(
+            patch("rcmpy.server.run_request", wraps=run_request)
+        )
+
+        with scenario("simple"):
+            # Setting up the scenario is forwarded too.
+            assert handled.call_count > 0
+            handled.reset_mock()
+            capsys.readouterr()
+
+            assert rcmpy_main([PKG_NAME, "dump"]) == 0
+            data = json.loads(capsys.readouterr().out)
+            assert "env" in data
+            assert handled.call_count == 1
+
+            # Arguments are parsed before forwarding.
+            assert rcmpy_main([PKG_NAME, "dump", "-x"]) == 2
+            assert "unrecognized arguments" in capsys.readouterr().err
+            assert handled.call_count == 1
+
+            assert rcmpy_main([PKG_NAME, "variant", "test"]) == 0
+            assert rcmpy_main([PKG_NAME, "apply"]) == 0
+            assert handled.call_count == 3
+
+            # Long-running commands aren't forwarded.
+            with patch("rcmpy.commands.apply.run_env_command") as run:
+                run.return_value = 0
+                assert rcmpy_main([PKG_NAME, "apply", "-w"]) == 0
+                assert run.call_count == 1
+            assert handled.call_count == 3
+
+            with override_environ(NO_SERVER_ENV, "1"):
+                assert rcmpy_main([PKG_NAME, "dump"]) == 0
+            assert handled.call_count == 3
+
+    assert not path.exists()
+
+
+def test_server_version_mismatch():
+    """Test that a server rejects requests from other versions."""
+
+    assert run_request({"version": "0.0.0", "argv": []}) == {"code": None}
+
+
+def test_serve_command(monkeypatch):
+    """Test the 'serve' command."""
+
+    with override_environ_tempdir("XDG_RUNTIME_DIR"):
+        assert rcmpy_main([PKG_NAME, "serve", "--idle", "0.1"]) == 0
+        assert not socket_path().exists()
+
+        # A server that's already running can't be started again.
+        with Server():
+            assert rcmpy_main([PKG_NAME, "serve", "--idle", "0.1"]) == 1
+
+        # Serving requires Unix sockets.
+        monkeypatch.delattr(socket, "AF_UNIX")
+        assert rcmpy_main([PKG_NAME, "serve", "--idle", "0.1"]) == 1
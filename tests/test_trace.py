@@ -0,0 +1,69 @@
+"""
+Test the 'trace' module.
+"""
+
+# built-in
+import json
+from tempfile import TemporaryDirectory
+
+# module under test
+from rcmpy import PKG_NAME, trace
+from rcmpy.entry import main as rcmpy_main
+
+# internal
+from tests.resources import scenario
+
+
+def test_span_disabled():
+    """Test that spans do nothing when tracing isn't enabled."""
+
+    assert trace.TRACER is None
+    assert trace.span("test", arg=1) is trace.NULL_SPAN
+
+    with trace.traced(None):
+        assert trace.TRACER is None
+
+
+def test_span_totals():
+    """Test collecting span totals without writing a trace."""
+
+    with trace.traced(None, totals=True):
+        assert trace.TRACER is not None
+        for _ in range(2):
+            with trace.span("test"):
+                pass
+
+        assert not trace.TRACER.events
+        assert set(trace.take_totals(["test", "other"])) == {"test"}
+        assert not trace.take_totals(["test"])
+
+    assert not trace.take_totals(["test"])
+
+
+def test_apply_trace():
+    """Test tracing the 'apply' command."""
+
+    with TemporaryDirectory() as tmp, scenario("simple", variant="test"):
+        path = f"{tmp}/trace.json"
+        assert rcmpy_main([PKG_NAME, "apply", "--trace", path]) == 0
+        assert trace.TRACER is None
+
+        with open(path, encoding="utf-8") as path_fd:
+            data = json.load(path_fd)
+
+    events = [x for x in data["traceEvents"] if x["ph"] == "X"]
+    names = {x["name"] for x in events}
+    for name in [
+        "apply",
+        "load_state",
+        "save_state",
+        "variables",
+        "configs",
+        "manifest",
+        "pending",
+        "render",
+        "update",
+    ]:
+        assert name in names, name
+
+    assert all(x["dur"] >= 0.0 for x in events)
@@ -0,0 +1,95 @@
+"""
+Test the 'watch.environment' module.
+"""
+
+# built-in
+from argparse import Namespace
+from asyncio import Event, create_task, run, sleep
+from functools import partial
+from pathlib import Path
+from shutil import copytree, ignore_patterns
+from tempfile import TemporaryDirectory
+
+# module under test
+from rcmpy import PKG_NAME
+from rcmpy.commands.apply import apply_env
+from rcmpy.entry import main as rcmpy_main
+from rcmpy.environment import Environment, load_environment
+from rcmpy.watch.environment import watch_environment
+from rcmpy.watch.params import WatchParams
+
+# internal
+from tests.resources import resource, scenario
+
+
+async def check_watch(env: Environment, root: Path) -> None:
+    """Verify that changes to a data repository are applied."""
+
+    output = root.joinpath("rcmpy-out", "other.txt")
+    assert output.read_text(encoding="utf-8").strip() == "3"
+
+    stop_sig = Event()
+    task = create_task(
+        watch_environment(
+            stop_sig,
+            env,
+            partial(
+                apply_env,
+                Namespace(
+                    force=False, dry_run=False, jobs=1, durability="none"
+                ),
+                env,
+            ),
+            WatchParams(root, root, [], True, poll_rate=0.01, settle=0.01),
+        )
+    )
+
+    async def wait_for_output(expected: str) -> None:
+        """Wait for the output file to have some contents."""
+
+        for _ in range(500):
+            if output.read_text(encoding="utf-8").strip() == expected:
+                return
+            await sleep(0.01)
+        assert output.read_text(encoding="utf-8").strip() == expected
+
+    await sleep(0.05)
+
+    # Changing variables (which configs use) updates the output.
+    root.joinpath("variables", "common", "test.yaml").write_text(
+        "---\na: 1\nb: 2\nc: 7\n", encoding="utf-8"
+    )
+    await wait_for_output("7")
+
+    # Changing the template updates the output.
+    root.joinpath("templates", "common", "other.txt.j2").write_text(
+        "{{test.c}}!\n", encoding="utf-8"
+    )
+    await wait_for_output("7!")
+
+    # Invalid data doesn't stop the task.
+    root.joinpath("variables", "common", "test.yaml").write_text(
+        "---\na: [\n", encoding="utf-8"
+    )
+    await sleep(0.1)
+    assert not task.done()
+
+    stop_sig.set()
+    assert await task == 0
+
+
+def test_watch_environment():
+    """Test keeping an environment up-to-date with its data repository."""
+
+    with scenario("simple", variant="test"), TemporaryDirectory() as tmp:
+        root = Path(tmp, "repository")
+        copytree(
+            resource("scenarios", "simple"),
+            root,
+            ignore=ignore_patterns("build", "rcmpy-out"),
+        )
+        assert rcmpy_main([PKG_NAME, "use", str(root)]) == 0
+        assert rcmpy_main([PKG_NAME, "apply"]) == 0
+
+        with load_environment() as env:
+            run(check_watch(env, root.resolve()))
@@ -0,0 +1,90 @@
+"""
+Test the 'watch.filters' module.
+"""
+
+# built-in
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+# module under test
+from rcmpy.watch.filters import PathFilter, PathFilters
+
+
+def test_path_filter():
+    """Test path filtering."""
+
+    with TemporaryDirectory() as tmp:
+        root = Path(tmp)
+
+        for path in [
+            ".git/HEAD",
+            "build/out.txt",
+            "node_modules/pkg/index.js",
+            "src/a.py",
+            "src/a.pyc",
+            "src/keep.pyc",
+            "src/build/b.py",
+            "README.md",
+        ]:
+            root.joinpath(path).parent.mkdir(parents=True, exist_ok=True)
+            root.joinpath(path).write_text("data", encoding="utf-8")
+
+        root.joinpath(".gitignore").write_text(
+            "# comment\n\n/build/\n*.pyc\n!keep.pyc\n"
+        )
+
+        def files(path_filter: PathFilter) -> set:
+            """Get the set of relative paths allowed by a filter."""
+            return set(
+                path_filter.relative(x) for x in path_filter.files(root)
+            )
+
+        assert len(files(PathFilter(root))) == 9
+
+        assert files(
+            PathFilter(root, exclude=["node_modules"], gitignore=True)
+        ) == {
+            ".gitignore",
+            "src/a.py",
+            "src/keep.pyc",
+            "src/build/b.py",
+            "README.md",
+        }
+
+        assert files(
+            PathFilter(root, include=["*.py"], exclude=["src/build"])
+        ) == {"src/a.py"}
+
+        # Excluded directories aren't traversed.
+        assert set(
+            x.relative_to(root).as_posix()
+            for x in PathFilter(root, gitignore=True).directories(root)
+        ) == {".", "node_modules", "node_modules/pkg", "src", "src/build"}
+
+
+def test_path_filters():
+    """Test combining path filters."""
+
+    with TemporaryDirectory() as tmp:
+        root = Path(tmp).resolve()
+        for path in ["a/x.txt", "a/b/y.txt", "c/z.txt", "d/w.txt"]:
+            root.joinpath(path).parent.mkdir(parents=True, exist_ok=True)
+            root.joinpath(path).write_text("data", encoding="utf-8")
+
+        first = PathFilter(root.joinpath("a"), exclude=["b"])
+        second = PathFilter(root.joinpath("a", "b"))
+        third = PathFilter(root.joinpath("c"))
+        filters = PathFilters([first, second, third])
+
+        # Nested roots aren't traversed separately.
+        assert filters.roots == [root.joinpath("a"), root.joinpath("c")]
+        assert set(
+            x.relative_to(root).as_posix()
+            for root_dir in filters.roots
+            for x in filters.files(root_dir)
+        ) == {"a/x.txt", "a/b/y.txt", "c/z.txt"}
+
+        assert first.selects(root.joinpath("a", "x.txt"))
+        assert not first.selects(root.joinpath("a", "b", "y.txt"))
+        assert second.selects(root.joinpath("a", "b", "y.txt"))
+        assert not third.selects(root.joinpath("d", "w.txt"))
@@ -0,0 +1,145 @@
+"""
+Test the 'watch.runner' module.
+"""
+
+# built-in
+from asyncio import run, sleep
+from contextlib import ExitStack
+from pathlib import Path
+import sys
+from tempfile import TemporaryDirectory
+
+# module under test
+from rcmpy.watch.params import WatchParams
+from rcmpy.watch.runner import CommandRunner
+from rcmpy.watch.source import PollingSource
+
+
+async def check_runner(root: Path) -> None:
+    """Verify that bursts of changes are coalesced into single runs."""
+
+    directory = root.joinpath("watched")
+    directory.mkdir()
+    output = root.joinpath("runs.txt")
+
+    params = WatchParams(
+        root,
+        directory,
+        [
+            sys.executable,
+            "-c",
+            "import time;"
+            f"open({str(output)!r}, 'a').write('run\\n');"
+            "time.sleep(0.2)",
+        ],
+        True,
+        poll_rate=0.01,
+        settle=0.05,
+    )
+
+    def runs() -> int:
+        """Get the number of times the command ran."""
+        return len(output.read_text().splitlines()) if output.is_file() else 0
+
+    with ExitStack() as stack:
+        source = PollingSource(params, stack)
+        runner = CommandRunner(params)
+
+        async def step(count: int = 1) -> None:
+            """Run iterations of the watch loop."""
+            for _ in range(count):
+                runner.add(source.poll())
+                runner.service()
+                await runner.wait(source)
+
+        # A burst of changes (spread across polls) results in one run.
+        for idx in range(5):
+            directory.joinpath(f"{idx}.txt").write_text("a")
+            await step()
+        assert runner.runs == 0
+        await step(10)
+        assert runner.runs == 1
+
+        # Changes during a run result in a single follow-up run.
+        for idx in range(5):
+            directory.joinpath(f"{idx}.txt").write_text("b")
+            await step()
+        assert runner.running
+        assert runner.runs == 1
+
+        while runner.runs < 2:
+            await step()
+        await runner.finish()
+        await sleep(0.1)
+        await step(5)
+
+        assert runner.runs == 2
+        assert runs() == 2
+
+
+def test_command_runner():
+    """Test the command runner."""
+
+    with TemporaryDirectory() as tmp:
+        run(check_runner(Path(tmp)))
+
+
+async def check_restart(root: Path, script: str) -> None:
+    """Verify that restart mode terminates and re-runs commands."""
+
+    directory = root.joinpath("watched")
+    directory.mkdir()
+    output = root.joinpath("runs.txt")
+    started = script.format(output=str(output))
+
+    params = WatchParams(
+        root,
+        directory,
+        [sys.executable, "-c", started],
+        True,
+        poll_rate=0.01,
+        settle=0.01,
+        restart=True,
+        grace=0.2,
+    )
+
+    def runs() -> int:
+        """Get the number of times the command started."""
+        return len(output.read_text().splitlines()) if output.is_file() else 0
+
+    with ExitStack() as stack:
+        source = PollingSource(params, stack)
+        runner = CommandRunner(params)
+
+        async def step() -> None:
+            """Run an iteration of the watch loop."""
+            runner.add(source.poll())
+            runner.service()
+            await runner.wait(source)
+
+        for expected in range(1, 3):
+            directory.joinpath("file.txt").write_text(str(expected))
+            while runs() < expected:
+                await step()
+            assert runner.running
+
+        await runner.finish(cancel=True)
+        assert not runner.running
+        assert runner.runs == 2
+
+
+def test_command_runner_restart():
+    """Test the command runner's restart mode."""
+
+    for script in [
+        # A command that exits when asked to.
+        "import time; open({output!r}, 'a').write('run\\n'); time.sleep(30)",
+        # A command that has to be killed.
+        (
+            "import signal, time; signal.signal(signal.SIGTERM, "
+            "signal.SIG_IGN); open({output!r}, 'a').write('run\\n'); "
+            "time.sleep(30)"
+        ),
+    ]:
+        with TemporaryDirectory() as tmp:
+            run(check_restart(Path(tmp), script))
@@ -0,0 +1,128 @@
+"""
+Test the 'watch.source' and 'watch.inotify' modules.
+"""
+
+# built-in
+from asyncio import run
+from contextlib import ExitStack
+import errno
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Type
+from unittest.mock import patch
+
+# third-party
+from pytest import mark
+
+# module under test
+from rcmpy.watch.inotify import (
+    IN_Q_OVERFLOW,
+    InotifySource,
+    inotify_available,
+)
+from rcmpy.watch.params import WatchParams
+from rcmpy.watch.source import EventSource, PollingSource
+
+
+async def check_source(kind: Type[EventSource], root: Path) -> None:
+    """Verify that an event source reports file changes."""
+
+    directory = root.joinpath("watched")
+    directory.mkdir()
+    existing = directory.joinpath("existing.txt")
+    existing.write_text("a")
+
+    params = WatchParams(root, directory, [], True)
+
+    with ExitStack() as stack:
+        source = kind(params, stack)
+
+        # Every file is reported initially.
+        assert source.poll() == {existing.resolve()}
+        await source.wait(0.01)
+        assert not source.poll()
+
+        # Changed, created and removed files are reported.
+        existing.write_text("b")
+        subdir = directory.joinpath("subdir")
+        subdir.mkdir()
+        created = subdir.joinpath("created.txt")
+        created.write_text("c")
+        await source.wait(0.1)
+        assert source.poll() == {existing.resolve(), created.resolve()}
+
+        created.write_text("d")
+        await source.wait(0.1)
+        assert source.poll() == {created.resolve()}
+
+        existing.unlink()
+        await source.wait(0.1)
+        assert source.poll() == {existing.resolve()}
+
+        # Re-writing the same contents isn't a change.
+        created.write_text("d")
+        await source.wait(0.01)
+        assert not source.poll()
+
+
+def test_polling_source():
+    """Test the polling event source."""
+
+    with TemporaryDirectory() as tmp:
+        run(check_source(PollingSource, Path(tmp)))
+
+
+@mark.skipif(not inotify_available(), reason="inotify isn't available")
+def test_inotify_source():
+    """Test the inotify event source."""
+
+    with TemporaryDirectory() as tmp:
+        run(check_source(InotifySource, Path(tmp)))
+
+
+@mark.skipif(not inotify_available(), reason="inotify isn't available")
+def test_inotify_source_recovery():
+    """Test that the inotify event source recovers from lost events."""
+
+    with TemporaryDirectory() as tmp, ExitStack() as stack:
+        root = Path(tmp).resolve()
+        source = InotifySource(WatchParams(root, root, [], True), stack)
+        assert not source.poll()
+
+        # Directories whose creation events are lost are still watched
+        # (after the event queue overflows).
+        subdir = root.joinpath("subdir")
+        subdir.mkdir()
+        created = subdir.joinpath("created.txt")
+        created.write_text("a", encoding="utf-8")
+        source.read()
+        source.new_directories.clear()
+        source.pending.clear()
+        source.handle(0, IN_Q_OVERFLOW, "")
+        assert source.poll() == {created}
+        assert subdir in source.watches.values()
+
+        # Fall back to checking every file if directories can't be watched.
+        with patch(
+            "rcmpy.watch.inotify.check_call",
+            side_effect=OSError(errno.ENOSPC, "No space left on device"),
+        ):
+            unwatched = root.joinpath("unwatched")
+            unwatched.mkdir()
+            source.read()
+            assert not source.poll()
+            assert source.polling
+            assert unwatched not in source.watches.values()
+
+        other = unwatched.joinpath("other.txt")
+        other.write_text("b", encoding="utf-8")
+        assert source.poll() == {other}
+
+        # Directories removed before they're watched are skipped.
+        source.polling = False
+        with patch(
+            "rcmpy.watch.inotify.check_call",
+            side_effect=OSError(errno.ENOENT, "No such file or directory"),
+        ):
+            source.add_watches(root)
+            assert not source.polling